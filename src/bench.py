@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import typing
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import const as c
+from . import utils as u
+from . import godaddy
+
+
+# Benchmarks for `bench`: every API-bound figure runs against FakeGoDaddy on localhost, so the
+# numbers measure this tool (engine, bulk requests, retries) rather than GoDaddy or the network.
+
+
+# --- Stand-in GoDaddy API -------------------------------------------------------------------+
+
+
+def _is_available(domain: str) -> bool:
+    "Stable across runs, about one in four names is free."
+    return hashlib.blake2b(domain.lower().encode(), digest_size=1).digest()[0] % 4 == 0
+
+
+def _availability(domain: str) -> dict:
+    available = _is_available(domain)
+    result = {"domain": domain, "available": available, "definitive": False}
+    if available:
+        result.update({"price": 11_990_000, "currency": "USD", "period": 1})
+    return result
+
+
+class FakeGoDaddy:
+    """Local HTTP server answering /v1/domains/available (GET and bulk POST) and /v1/domains
+    (paginated) like the real API. Every request waits `latency` seconds, then fails with a
+    500 at `error_rate` or a 429 with `retryAfterSec` at `rate_429`."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_429: float = 0.0,
+        retry_after: float = 1.0,
+        portfolio: int = 5000,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.portfolio = [
+            {"domain": f"site{i:06d}.com", "status": "ACTIVE", "expires": "2030-01-01T00:00:00.000Z"}
+            for i in range(portfolio)
+        ]
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeGoDaddy:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-godaddy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeGoDaddy:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _fault(self) -> tuple[int, dict] | None:
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+        if roll < self.rate_429:
+            return 429, {"code": "TOO_MANY_REQUESTS", "retryAfterSec": self.retry_after}
+        if roll < self.rate_429 + self.error_rate:
+            return 500, {"code": "INTERNAL_SERVER_ERROR", "message": "injected failure"}
+        return None
+
+    def _list(self, query: dict) -> list[dict]:
+        limit = int(query.get("limit", ["1000"])[0])
+        marker = query.get("marker", [None])[0]
+        start = 0
+        if marker is not None:
+            start = next((i + 1 for i, d in enumerate(self.portfolio) if d["domain"] == marker), len(self.portfolio))
+        return self.portfolio[start : start + limit]
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API behind the pooled session.
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def _reply(self, status: int, body: typing.Any) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _serve(self, method: str) -> None:
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = self.rfile.read(length) if length else b""
+
+                if fake.latency:
+                    time.sleep(fake.latency)
+                fault = fake._fault()
+                if fault:
+                    return self._reply(*fault)
+
+                if url.path == "/v1/domains/available" and method == "GET":
+                    return self._reply(200, _availability(query["domain"][0]))
+                if url.path == "/v1/domains/available" and method == "POST":
+                    return self._reply(200, {"domains": [_availability(d) for d in json.loads(payload)]})
+                if url.path == "/v1/domains" and method == "GET":
+                    return self._reply(200, fake._list(query))
+                return self._reply(404, {"code": "NOT_FOUND"})
+
+            def do_GET(self) -> None:
+                self._serve("GET")
+
+            def do_POST(self) -> None:
+                self._serve("POST")
+
+        return Handler
+
+
+def use_server(url: str) -> None:
+    "Point the API client at `url` with dummy keys and no client-side rate limit."
+
+    godaddy.API_URL = url
+    c.OTE = False
+    c.GODADDY_API_KEY = c.GODADDY_API_SECRET = "bench"
+    c.RATE_LIMITS = {endpoint: (1_000_000, 1) for endpoint in c.RATE_LIMITS}
+    godaddy._headers.clear()
+    godaddy._buckets.clear()
+
+
+# --- Measurements ---------------------------------------------------------------------------+
+
+# name: (value, unit). Every unit is a rate except for "ms", where lower is better.
+Results = dict[str, tuple[float, str]]
+
+
+def _names(n: int, seed: int = 0) -> list[str]:
+    rand = random.Random(seed)
+    return [
+        "".join(rand.choices(string.ascii_lowercase, k=rand.randint(5, 12))) for _ in range(n)
+    ]
+
+
+def _rate(count: int, seconds: float) -> float:
+    return count / seconds if seconds > 0 else float("inf")
+
+
+def bench_startup(runs: int = 5) -> float:
+    "Best wall time of `--help` in a fresh interpreter, in ms: the import budget of every command."
+
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(package_dir))
+    command = [sys.executable, "-m", os.path.basename(package_dir), "--help"]
+
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_typo_generation(brands: list[str], depth: int, seconds: float = 0.5) -> float:
+    "Unique typos generated per second, repeating `brands` for at least `seconds`."
+
+    from .typo import unique_typos
+
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        count += sum(1 for brand in brands for _ in unique_typos(brand, depth=depth))
+    return _rate(count, time.perf_counter() - start)
+
+
+def bench_formatter(n: int) -> float:
+    "Result lines rendered per second, colors included."
+
+    formatter = u.ResponseFormatter(color=True)
+    rows = [
+        {
+            "domain": f"{name}.com",
+            "available": _is_available(name),
+            "price": 11_990_000,
+            "currency": "USD",
+            "tags": "[A1,C1]",
+            "link": godaddy.godaddy_search_link(f"{name}.com"),
+        }
+        for name in _names(min(n, 10_000))
+    ]
+
+    start = time.perf_counter()
+    for i in range(n):
+        formatter.format(rows[i % len(rows)])
+    return _rate(n, time.perf_counter() - start)
+
+
+def bench_cache(n: int) -> tuple[float, float]:
+    "Rows per second written with put_many and read back with get_many, on a scratch store."
+
+    from .store import ResultStore
+
+    domains = [f"{name}.com" for name in _names(n)]
+    items = [(d, _availability(d)) for d in domains]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, "bench.sqlite3"), lambda result: 3600)
+
+        start = time.perf_counter()
+        for i in range(0, n, c.BULK_SIZE):
+            store.put_many(items[i : i + c.BULK_SIZE])
+        write = _rate(n, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(0, n, c.BULK_SIZE):
+            store.get_many(domains[i : i + c.BULK_SIZE])
+        read = _rate(n, time.perf_counter() - start)
+
+    return write, read
+
+
+def _checks_per_second(jobs: typing.Iterable[tuple[str, str, dict]], batch_size: int | None = None) -> float:
+    from . import engine
+
+    count = 0
+
+    def on_result(result: dict) -> None:
+        nonlocal count
+        count += 1
+
+    start = time.perf_counter()
+    engine.run(jobs, on_result, batch_size=batch_size)
+    return _rate(count, time.perf_counter() - start)
+
+
+def bench_run(n: int, batch_size: int | None = None) -> float:
+    "End-to-end availability checks per second for `run`, without the cache."
+    return _checks_per_second(((name, "com", {}) for name in _names(n)), batch_size)
+
+
+def bench_typo(brand: str, depth: int) -> float:
+    "End-to-end checks per second for `typo`, generation included."
+
+    from .typo import generate_typos
+
+    return _checks_per_second(generate_typos(brand, "com", None, depth))
+
+
+def bench_portfolio() -> float:
+    "Account domains listed per second through the paginated /v1/domains."
+
+    start = time.perf_counter()
+    count = sum(1 for _ in godaddy.registered_domains())
+    return _rate(count, time.perf_counter() - start)
+
+
+def run_all(size: int = 20_000, server: FakeGoDaddy | None = None) -> Results:
+    """Every benchmark, `size` scaling the API-bound and cache ones. API-bound figures go
+    through `server`, a default FakeGoDaddy if none is given."""
+
+    results: Results = {}
+    results["startup"] = (bench_startup(), "ms")
+
+    brands = ["example", "godaddy", "domainfinder", "typosquatting", "brand"]
+    results["typo_generation_depth1"] = (bench_typo_generation(brands, 1), "typos/s")
+    results["typo_generation_depth2"] = (bench_typo_generation(brands[:2], 2), "typos/s")
+    results["formatter"] = (bench_formatter(size * 5), "lines/s")
+
+    write, read = bench_cache(size)
+    results["cache_put_many"] = (write, "rows/s")
+    results["cache_get_many"] = (read, "rows/s")
+
+    saved = (c.CHECK_AVAILABILITY, c.CACHED, c.ZONE_INDEX, c.DNS_PRESCREEN, godaddy.API_URL, c.RATE_LIMITS)
+    c.CHECK_AVAILABILITY, c.CACHED, c.ZONE_INDEX, c.DNS_PRESCREEN = True, False, None, False
+
+    server = server or FakeGoDaddy()
+    try:
+        with server:
+            use_server(server.url)
+            results["run_bulk"] = (bench_run(size), "checks/s")
+            results["run_single"] = (bench_run(max(size // 20, 1), batch_size=1), "checks/s")
+            results["typo_depth2"] = (bench_typo("example", 2), "checks/s")
+            results["portfolio"] = (bench_portfolio(), "domains/s")
+    finally:
+        c.CHECK_AVAILABILITY, c.CACHED, c.ZONE_INDEX, c.DNS_PRESCREEN, godaddy.API_URL, c.RATE_LIMITS = saved
+        godaddy._headers.clear()
+        godaddy._buckets.clear()
+
+    return results
+
+
+# --- Baselines ------------------------------------------------------------------------------+
+
+
+def save(results: Results, path: str, params: dict | None = None) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params or {},
+        "results": {name: {"value": value, "unit": unit} for name, (value, unit) in results.items()},
+    }
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def load(path: str) -> Results:
+    with open(path, "r", encoding="utf-8") as f:
+        document = json.load(f)
+    return {name: (r["value"], r["unit"]) for name, r in document["results"].items()}
+
+
+def change(value: float, previous: float, unit: str) -> float:
+    "Relative change from `previous` to `value`, positive is better whatever the unit."
+
+    if not previous:
+        return 0.0
+    if unit == "ms":  # a duration: lower is better.
+        return previous / value - 1 if value else 0.0
+    return value / previous - 1
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> dict[str, float]:
+    """name: relative change against the baseline, positive is better, for every benchmark
+    that got worse by more than `tolerance` (0.2 is 20%)."""
+
+    regressions = {}
+    for name, (value, unit) in results.items():
+        if name not in baseline or not baseline[name][0]:
+            continue
+        if (delta := change(value, baseline[name][0], unit)) < -tolerance:
+            regressions[name] = delta
+    return regressions
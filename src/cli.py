@@ -1,17 +1,36 @@
 #!/usr/bin/env python3
 
 import click
-import sys
 import os
-import webbrowser
 import time
-import json
+import re
 
 from . import const as c
 from . import utils as u
 from . import godaddy
 
 
+def _regex_option(ctx: click.Context, param: click.Parameter, value: str | None) -> str | None:
+    if value is not None:
+        try:
+            re.compile(value)
+        except re.error as e:
+            raise click.BadParameter(f"invalid regular expression: {e}.")
+    return value
+
+
+def _charset_option(ctx: click.Context, param: click.Parameter, value: str | None) -> tuple | None:
+    from .filters import CHARSETS
+
+    if value is None:
+        return None
+    classes = tuple(cls.strip().lower() for cls in value.split(",") if cls.strip())
+    unknown = set(classes) - set(CHARSETS)
+    if unknown or not classes:
+        raise click.BadParameter(f"choose from {', '.join(CHARSETS)}.")
+    return classes
+
+
 @click.group(invoke_without_command=True)
 @click.option(
     "-v",
@@ -51,6 +70,13 @@ from . import godaddy
     show_choices=False,
     help="Set the global log level.",
 )
+@click.option(
+    "--log-max-size",
+    type=click.FloatRange(min=0),
+    default=c.LOG_MAX_BYTES / 2**20,
+    show_default=True,
+    help="Rotate the log file at this many MiB, keeping a few old ones. 0 truncates it on every start.",
+)
 @click.option(
     "-c",
     "--check-availability",
@@ -68,18 +94,151 @@ from . import godaddy
     "--grep",
     type=str,
     default=None,
-    help="Filter typo results by a specific substring.",
+    help="Only check domains containing this substring. Applied before any lookup.",
+)
+@click.option(
+    "--match",
+    type=str,
+    default=None,
+    callback=_regex_option,
+    help="Only check domains matching this regular expression. Applied before any lookup.",
+)
+@click.option(
+    "--min-length",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only check names at least this long, TLD excluded.",
+)
+@click.option(
+    "--max-length",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only check names at most this long, TLD excluded.",
+)
+@click.option(
+    "--charset",
+    type=str,
+    default=None,
+    callback=_charset_option,
+    help="Only check names made of these character classes, comma-separated: letters, digits, hyphen.",
+)
+@click.option(
+    "--available-only",
+    is_flag=True,
+    help="Only report AVAILABLE domains.",
+)
+@click.option(
+    "--max-price",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Only report domains priced at most this much, in the API's currency.",
 )
 @click.option(
     "-C",
     "--cached",
     is_flag=True,
-    help="Enable cached mode: skips domains previously checked and stores new results in a cache file located in the log directory.",
+    help="Enable cached mode: skips domains previously checked and stores new results in a SQLite cache located in the log directory.",
 )
 @click.option(
     "--clear-cache",
     is_flag=True,
-    help="Clear the local cache. Recommended for daily use since domain availability can change frequently.",
+    help="Clear the whole local cache. Entries already expire on their own, see --ttl-available/--ttl-taken.",
+)
+@click.option(
+    "--ttl-available",
+    type=click.FloatRange(min=0),
+    default=c.CACHE_TTL_AVAILABLE / 3600,
+    show_default=True,
+    help="Hours a cached AVAILABLE result stays fresh before it is checked again.",
+)
+@click.option(
+    "--ttl-taken",
+    type=click.FloatRange(min=0),
+    default=c.CACHE_TTL_TAKEN / 3600,
+    show_default=True,
+    help="Hours a cached NOT AVAILABLE result stays fresh before it is checked again.",
+)
+@click.option(
+    "-j",
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=c.CONCURRENCY,
+    show_default=True,
+    help="Maximum number of availability requests in flight at once.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    type=click.IntRange(min=1, max=c.BULK_SIZE),
+    default=c.BULK_SIZE,
+    show_default=True,
+    help="Domains per bulk availability request.",
+)
+@click.option(
+    "--dns-prescreen",
+    is_flag=True,
+    help="Resolve NS/SOA records first and skip the API for names that are already delegated.",
+)
+@click.option(
+    "--resolver",
+    type=str,
+    default=c.DNS_RESOLVER,
+    show_default=True,
+    help="DNS resolver used by --dns-prescreen, as host[:port].",
+)
+@click.option(
+    "--zone-index",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Zone index built by `index-zones`; names in it are reported taken without a lookup.",
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=1),
+    default=c.POOL_SIZE,
+    show_default=True,
+    help="Keep-alive HTTP connections kept open to the GoDaddy API.",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=c.READ_TIMEOUT,
+    show_default=True,
+    help="Seconds to wait for a GoDaddy API response.",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["text", "jsonl", "csv", "parquet"]),
+    default=c.OUTPUT_FORMAT,
+    show_default=True,
+    help="Result format. Machine-readable formats skip colors, links and per-result log lines.",
+)
+@click.option(
+    "--output",
+    "output_path",
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    default=c.OUTPUT_PATH,
+    show_default=True,
+    help="File for --output-format jsonl/csv/parquet, '-' for stdout.",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    help="Print per-stage counts and latencies (p50/p95/p99) to stderr when the command ends.",
+)
+@click.option(
+    "--stats-file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Also write the stats to this file when the command ends.",
+)
+@click.option(
+    "--stats-format",
+    type=click.Choice(["prometheus", "json"]),
+    default="prometheus",
+    show_default=True,
+    help="Format of --stats-file.",
 )
 @click.option(
     "--ote",
@@ -94,40 +253,89 @@ def maincli(
     verbose,
     silent,
     loglevel,
+    log_max_size,
     check_availability,
     open_available_links,
     grep,
+    match,
+    min_length,
+    max_length,
+    charset,
+    available_only,
+    max_price,
     testrun,
     cached,
     clear_cache,
+    ttl_available,
+    ttl_taken,
+    concurrency,
+    batch_size,
+    dns_prescreen,
+    resolver,
+    zone_index,
+    pool_size,
+    timeout,
+    output_format,
+    output_path,
+    show_stats,
+    stats_file,
+    stats_format,
+    ote,
 ) -> None:
     """Steam engine for search and generation of valuables domains.\n
     [DEBUG] -t / --testrun is a debug feature for running especific functions, only use it if you know what you are doing.\n
     """
 
     if clear_cache:
-        with open(c.CACHE_FILE, "w") as file:
-            json.dump({}, file, indent=4)
+        u.get_store().clear()
 
     c.VERBOSE = verbose
     c.LOGLEVEL = u.get_loglevl(loglevel)
     c.SILENT = silent
+    c.LOG_MAX_BYTES = int(log_max_size * 2**20)
     c.CHECK_AVAILABILITY = check_availability
     c.OPEN_AVAILABLE_LINKS = open_available_links
     c.GREP = grep
+    c.MATCH = match
+    c.MIN_LENGTH = min_length
+    c.MAX_LENGTH = max_length
+    c.CHARSET = charset
+    c.AVAILABLE_ONLY = available_only
+    c.MAX_PRICE = max_price
     c.CACHED = cached
+    c.CACHE_TTL_AVAILABLE = ttl_available * 3600
+    c.CACHE_TTL_TAKEN = ttl_taken * 3600
+    c.CONCURRENCY = concurrency
+    c.BULK_SIZE = batch_size
+    c.DNS_PRESCREEN = dns_prescreen
+    c.DNS_RESOLVER = resolver
+    c.ZONE_INDEX = zone_index
+    c.POOL_SIZE = pool_size
+    c.READ_TIMEOUT = timeout
+    c.OUTPUT_FORMAT = output_format
+    c.OUTPUT_PATH = output_path
+    c.STATS = show_stats or bool(stats_file)
+    c.OTE = ote
 
     u.init_log_conf()  # set c.LOGGER
 
+    if c.CACHED:
+        u.start_cache_sweeper()
+
+    if c.STATS:
+        click.get_current_context().call_on_close(
+            lambda: _report_stats(show_stats, stats_file, stats_format)
+        )
+
     c.LOGGER.debug(
-        f"conf: {c.VERBOSE=} {c.LOGLEVEL=} {c.SILENT=} {c.CHECK_AVAILABILITY=} {c.OPEN_AVAILABLE_LINKS=} {c.GREP} {c.CACHED}"
+        f"conf: {c.VERBOSE=} {c.LOGLEVEL=} {c.SILENT=} {c.CHECK_AVAILABILITY=} {c.OPEN_AVAILABLE_LINKS=} {c.GREP} {c.CACHED} {c.CONCURRENCY=} {c.BULK_SIZE=} {c.DNS_PRESCREEN=} {c.OTE=}"
     )
 
     if not testrun:  # [DEBUG] Test run block.
         return
 
     start = time.time()
-    c.LOGGER.info(f"Initializing test.")
+    c.LOGGER.info("Initializing test.")
     if not c.SILENT: print()
 
     # --- TEST FUNCTION GOES HERE ------------------------+
@@ -137,45 +345,278 @@ def maincli(
     c.LOGGER.info(f"Test finished in: {round(time.time() - start, 2)}s")
 
 
+def _tlds_option(ctx: click.Context, param: click.Parameter, value: str | None) -> tuple[str, ...] | None:
+    if value is None:
+        return None
+    tlds = u.parse_tlds(value)
+    if not tlds:
+        raise click.BadParameter("give at least one TLD.")
+    return tlds
+
+
+def _report_stats(show: bool, path: str | None, format: str) -> None:
+    from .stats import stats
+
+    if show:
+        click.echo(stats.report(), err=True)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(stats.json() if format == "json" else stats.prometheus())
+
+
+def _run_job(command: str, params: dict, resume: str | None, jobs) -> None:
+    "Check `jobs` through the engine, journaling every result so the job can be resumed."
+
+    from . import engine
+    from .journal import Journal
+
+    if resume:
+        try:
+            journal = Journal.load(resume)
+        except FileNotFoundError:
+            raise click.BadParameter(
+                f"no journal for job {resume!r}, it finished or never existed.", param_hint="--resume"
+            )
+        if journal.header["command"] != command or journal.header["params"] != params:
+            raise click.UsageError(
+                f"Job {resume} was started as `{journal.header['command']}` with {journal.header['params']}, resume it with the same arguments."
+            )
+        if journal.finished:
+            click.echo(f"Job {resume} already finished.", err=True)
+            return
+    else:
+        journal = Journal.create(command, params)
+
+    c.LOGGER.info(f"Job {journal.job}: journal at {journal.path}")
+
+    from .filters import name_filter, result_filter
+    from .result import Result
+
+    names, results = name_filter(), result_filter()
+    emit = u.final
+    writer = None
+    if c.OUTPUT_FORMAT != "text":
+        from .output import open_writer
+
+        try:
+            writer = open_writer(c.OUTPUT_FORMAT, c.OUTPUT_PATH, append=bool(resume))
+        except FileExistsError as e:
+            journal.close()
+            raise click.UsageError(f"{e} Resume into a new --output file, or use csv or jsonl.")
+
+        from .stats import stats
+
+        emit = stats.timed("output")(writer.write)
+
+    def on_result(result: Result) -> None:
+        journal.record(result)
+        if not results or results(result):
+            emit(result)
+
+    try:
+        engine.run(journal.pending(jobs, names.keep if names else None), on_result)
+    except BaseException:
+        journal.close()
+        click.echo(f"Job {journal.job} stopped. Continue it with --resume {journal.job}", err=True)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()  # flush what was checked, an interrupted Parquet file still gets its footer.
+
+    journal.finish()
+    if journal.failed:
+        click.echo(
+            f"Job {journal.job}: {journal.failed} checks failed. Retry them with --resume {journal.job}", err=True
+        )
+
+
 @maincli.command(name="ls-domains")
 @click.option("-l", "--long", is_flag=True, help="Use a long listing format")
-def ls(long: bool) -> None:
+@click.option(
+    "--sort",
+    type=click.Choice(["domain", "expires", "created", "status"]),
+    default="domain",
+    show_default=True,
+    help="Sort key.",
+)
+@click.option("-r", "--reverse", is_flag=True, help="Reverse the sort order.")
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Sync changed domains from the API first, even if the local snapshot is recent.",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    help="Download the whole portfolio again instead of only changes. Done anyway once a week (PORTFOLIO_FULL_MAX_AGE).",
+)
+@click.option("--offline", is_flag=True, help="Never call the API, list the local snapshot.")
+def ls(long: bool, sort: str, reverse: bool, refresh: bool, full: bool, offline: bool) -> None:
     """List information about registered domains.
-    Sort entries alphabetically if --sort is not specified."""
-    raise NotImplementedError
+    Sort entries alphabetically if --sort is not specified.
+
+    The list comes from a local snapshot, synced with only the changes since the last time.
+    Domains cancelled or transferred out drop from it as soon as the API reports them, any
+    other departure only at the next full sync (weekly, or with --full)."""
+
+    from .store import PortfolioStore
+
+    portfolio = PortfolioStore(c.CACHE_DB)
+    synced_at = portfolio.synced_at
+    stale = synced_at is None or time.time() - synced_at > c.PORTFOLIO_MAX_AGE
+
+    if not offline and (full or refresh or stale):
+        started = time.time()
+        full_synced_at = portfolio.full_synced_at
+        full = full or full_synced_at is None or started - full_synced_at > c.PORTFOLIO_FULL_MAX_AGE
+        since = None if full else synced_at - c.PORTFOLIO_SYNC_MARGIN
+        fetched = list(godaddy.registered_domains(since))  # all pages before touching the snapshot.
+        portfolio.sync(fetched, started, full, c.PORTFOLIO_GONE_STATUSES)
+        c.LOGGER.info(f"ls-domains: {'full' if full else 'incremental'} sync, {len(fetched)} domains fetched")
+
+    key = {"domain": "domain", "expires": "expires", "created": "createdAt", "status": "status"}[sort]
+    domains = sorted(
+        portfolio.domains(),
+        key=lambda d: (str(d.get(key) or ""), d["domain"]),
+        reverse=reverse,
+    )
+
+    for d in domains:
+        if not long:
+            click.echo(d["domain"])
+            continue
+        click.echo(
+            f"{d.get('status', '-'):<20} "
+            f"{str(d.get('createdAt') or '-')[:10]:<10} "
+            f"{str(d.get('expires') or '-')[:10]:<10} "
+            f"{'renew' if d.get('renewAuto') else '-':<5} "
+            f"{'privacy' if d.get('privacy') else '-':<7} "
+            f"{'locked' if d.get('locked') else '-':<6} "
+            f"{d['domain']}"
+        )
 
 
 @maincli.command()
 @click.argument(
     "domain",
     type=str,
-    required=True,
+    required=False,
 )
 @click.argument(
     "tld",
     type=str,
     default="com",
     required=False,
+    callback=_tlds_option,
+)
+@click.option(
+    "--file",
+    "file_path",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+    help="Batch mode: file with one brand per line, '-' for stdin. Replaces DOMAIN. A typo shared by several brands is checked once, tagged with the first; brands are never typos of each other.",
+)
+@click.option(
+    "--tld",
+    "tld_option",
+    type=str,
+    default=None,
+    callback=_tlds_option,
+    help="Domain TLD, exclusive dot, or a comma-separated list: --tld=com,net,io. Overrides TLD, needed with --file.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Processes generating typos in batch mode.  [default: CPU count]",
 )
 @click.option(
     "--filter", is_flag=False, default=None, help="Filter rarity level. --filter=A1"
 )
-def typo(domain: str, tld: str, filter: str | None) -> None:
-    """Generate possible typos for a given domain."""
+@click.option(
+    "--depth",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Maximum number of combined edits per typo.",
+)
+@click.option(
+    "--beam",
+    type=click.IntRange(min=1),
+    default=c.TYPO_BEAM,
+    show_default=True,
+    help="Most plausible candidates kept per edit level when --depth > 1.",
+)
+@click.option(
+    "--layout",
+    type=click.Choice(sorted(c.KEYBOARD_LAYOUTS)),
+    default=c.KEYBOARD_LAYOUT,
+    show_default=True,
+    help="Keyboard layout for neighboring-key typos (A1, D1).",
+)
+@click.option(
+    "--homoglyphs",
+    type=click.Choice(sorted(c.HOMOGLYPH_SETS)),
+    default=c.HOMOGLYPH_SET,
+    show_default=True,
+    help="Look-alike character set for visual typos (C1).",
+)
+@click.option(
+    "--resume",
+    type=str,
+    default=None,
+    help="Continue an interrupted job by its id, given the same arguments.",
+)
+def typo(
+    domain: str | None,
+    tld: tuple[str, ...],
+    file_path: str | None,
+    tld_option: tuple[str, ...] | None,
+    workers: int | None,
+    filter: str | None,
+    depth: int,
+    beam: int,
+    layout: str,
+    homoglyphs: str,
+    resume: str | None,
+) -> None:
+    """Generate possible typos for a given domain, or for every brand in --file, checked under
+    every TLD given."""
 
-    from .typo import generate_typos
-    from .godaddy import godaddy_search_link
+    from .typo import generate_typos, generate_batch_typos
 
-    for t in generate_typos(domain, tld, filter):
-        u.final(t)
+    if bool(domain) == bool(file_path):
+        raise click.UsageError("Give either DOMAIN or --file.")
+
+    tlds = tld_option or tld
+    c.KEYBOARD_LAYOUT = layout
+    c.HOMOGLYPH_SET = homoglyphs
+    params = {
+        "domain": domain,
+        "tld": ",".join(tlds),
+        "filter": filter,
+        "depth": depth,
+        "beam": beam,
+        "layout": layout,
+        "homoglyphs": homoglyphs,
+    }
+
+    if file_path:
+        params["file_path"] = file_path
+        brands = u.read_domains(file_path, tlds)
+        jobs = generate_batch_typos(brands, tlds, filter, depth, beam, workers)
+    else:
+        jobs = generate_typos(domain, tlds, filter, depth, beam)
+
+    _run_job("typo", params, resume, jobs)
 
 
 @maincli.command()
 @click.option(
     "--file",
     "file_path",
-    type=click.Path(exists=True, dir_okay=False),
-    help="Path to a file containing domain names."
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+    help="File with one domain name per line, '-' for stdin. .gz and .zst files are decompressed on the fly.",
 )
 @click.argument("names", nargs=-1)
 @click.option(
@@ -183,27 +624,201 @@ def typo(domain: str, tld: str, filter: str | None) -> None:
     default="com",
     type=str,
     show_default=True,
-    help="Domain TLD, exclusive dot. --tld=me"
+    callback=_tlds_option,
+    help="Domain TLD, exclusive dot, or a comma-separated list. --tld=me or --tld=com,net,io"
+)
+@click.option(
+    "--resume",
+    type=str,
+    default=None,
+    help="Continue an interrupted job by its id, given the same arguments.",
 )
-def run(file_path: str | None, names: tuple[str], tld: str) -> None:
-    """Run through domain set list."""
+def run(file_path: str | None, names: tuple[str], tld: tuple[str, ...], resume: str | None) -> None:
+    """Run through domain set list, every name under every TLD."""
     if file_path:
-        click.echo(f"Reading domains from file: {file_path}")
-        with open(file_path, "r", encoding="utf-8") as f:
-            domains = [line.strip() for line in f if line.strip()]
+        click.echo(f"Reading domains from file: {file_path}", err=True)
+        domains = u.read_domains(file_path, tld)
     else:
         if not names:
             click.echo("Error: You must provide either --file or names.", err=True)
             raise click.Abort()
-        domains = list(names)
+        domains = filter(None, (u.normalize_domain(name, tld) for name in names))
+
+    from .engine import fan_out
+
+    params = {"file_path": file_path, "names": list(names), "tld": ",".join(tld)}
+    _run_job("run", params, resume, fan_out(((domain, {}) for domain in domains), tld))
+
+
+@maincli.command(name="index-zones")
+@click.argument(
+    "zone_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+)
+@click.option(
+    "-o",
+    "--out",
+    type=click.Path(dir_okay=False, writable=True),
+    default=c.ZONE_INDEX_FILE,
+    show_default=True,
+    help="Where to write the index.",
+)
+@click.option(
+    "--tld",
+    type=str,
+    default=None,
+    help="TLD appended to relative owner names, for zone files without fully qualified names.",
+)
+def index_zones(zone_files: tuple[str], out: str, tld: str | None) -> None:
+    """Build a memory-mapped index of registered domains from zone files (.gz/.zst ok).
+    Use it with --zone-index."""
+
+    from . import zoneindex
 
-    for domain in domains:
-        result: dict = {"domain": f"{domain}.{tld}"}
-        result.update(u.check_cached_availability(domain, tld))
-        u.final(result)
+    start = time.time()
+    count = zoneindex.build(zone_files, out, tld)
+    click.echo(f"Indexed {count:,} domains into {out} in {round(time.time() - start, 2)}s")
 
 
 @maincli.command()
-def evaluate() -> None:
+@click.argument("names", nargs=-1)
+@click.option(
+    "--file",
+    "file_path",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+    help="File with one domain per line, '-' for stdin. .gz and .zst files are decompressed on the fly.",
+)
+@click.option(
+    "--brand",
+    type=str,
+    default=None,
+    help="Source brand: adds edit distance to it as a feature. Without names, its typos are scored.",
+)
+@click.option(
+    "--tld",
+    default="com",
+    type=str,
+    show_default=True,
+    help="TLD for names given without one.",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=0),
+    default=50,
+    show_default=True,
+    help="Rows to print, 0 for all.",
+)
+def evaluate(
+    names: tuple[str], file_path: str | None, brand: str | None, tld: str, top: int
+) -> None:
     """Evaluate domains using implemented algorithm (No API access)"""
-    raise NotImplementedError
\ No newline at end of file
+
+    from .evaluate import evaluate as evaluate_domains
+
+    if file_path:
+        domains = u.read_domains(file_path)
+    elif names:
+        domains = names
+    elif brand:
+        from .typo import unique_typos
+
+        domains = (typo for typo, _ in unique_typos(brand))
+    else:
+        click.echo("Error: You must provide names, --file or --brand.", err=True)
+        raise click.Abort()
+
+    start = time.time()
+    c.DATAFRAME = evaluate_domains(domains, tld, brand)
+    c.LOGGER.info(f"Scored {len(c.DATAFRAME):,} domains in {round(time.time() - start, 2)}s")
+
+    columns = ["rank", "domain", "score", "length", "is_word", "two_words", "digits", "hyphens"]
+    if brand:
+        columns.append("brand_distance")
+    rows = c.DATAFRAME[columns] if not top else c.DATAFRAME[columns].head(top)
+    click.echo(rows.to_string(index=False, float_format=lambda f: f"{f:.2f}"))
+
+@maincli.command(hidden=True)
+@click.option(
+    "--size",
+    type=click.IntRange(min=1),
+    default=20_000,
+    show_default=True,
+    help="Names checked end to end, also scales the formatter and cache benchmarks.",
+)
+@click.option(
+    "--latency",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="Milliseconds the stand-in API waits before every response.",
+)
+@click.option(
+    "--error-rate",
+    type=click.FloatRange(min=0, max=1),
+    default=0.0,
+    show_default=True,
+    help="Share of stand-in API requests answered with HTTP 500.",
+)
+@click.option(
+    "--rate-429",
+    type=click.FloatRange(min=0, max=1),
+    default=0.0,
+    show_default=True,
+    help="Share of stand-in API requests answered with HTTP 429.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    default=c.BENCH_BASELINE,
+    show_default=True,
+    help="Baseline file the results are compared against.",
+)
+@click.option(
+    "--save",
+    is_flag=True,
+    help="Write the results as the new baseline.",
+)
+@click.option(
+    "--tolerance",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    help="Slowdown against the baseline reported as a regression, 0.2 is 20%.",
+)
+def bench(
+    size: int,
+    latency: float,
+    error_rate: float,
+    rate_429: float,
+    baseline: str,
+    save: bool,
+    tolerance: float,
+) -> None:
+    """[DEBUG] Benchmark generation, formatting, cache and checks against a local stand-in API.
+    Changes against the baseline are positive when faster, whatever the unit. Exits with 1 if
+    anything got slower than the baseline allows."""
+
+    from . import bench as b
+
+    params = {"size": size, "latency": latency, "error_rate": error_rate, "rate_429": rate_429}
+    server = b.FakeGoDaddy(latency / 1000, error_rate, rate_429)
+    results = b.run_all(size, server)
+
+    previous = b.load(baseline) if os.path.exists(baseline) else {}
+    regressions = b.compare(results, previous, tolerance)
+
+    for name, (value, unit) in results.items():
+        line = f"{name:<24} {value:>14,.1f} {unit}"
+        if name in previous:
+            line += f"  ({b.change(value, previous[name][0], unit):+.0%} vs baseline)"
+        if name in regressions:
+            line += "  REGRESSION"
+        click.echo(line)
+
+    if save:
+        b.save(results, baseline, params)
+        click.echo(f"Baseline written to {baseline}", err=True)
+    elif regressions:
+        raise SystemExit(1)
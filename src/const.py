@@ -1,19 +1,39 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import logging
-import pandas as pd
-import dotenv
 import os
+import typing
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
 
 # --- ENV ----------------------------------------------------------------------------------------+
 
-dotenv.load_dotenv(dotenv_path="/home/apollo/Code/dotcom/.venv/.env")
+# GODADDY_API_KEY, GODADDY_API_SECRET, OTE_GODADDY_API_KEY and OTE_GODADDY_API_SECRET are read
+# from the .env file on first access (see __getattr__ below), so commands that never touch the
+# API don't pay for dotenv.
+
+DOTENV_PATH: str = "/home/apollo/Code/dotcom/.venv/.env"
+_ENV_KEYS: tuple = (
+    "GODADDY_API_KEY",
+    "GODADDY_API_SECRET",
+    "OTE_GODADDY_API_KEY",
+    "OTE_GODADDY_API_SECRET",
+)
+
 
-GODADDY_API_KEY: str = os.getenv("GODADDY_API_KEY", default=None)
-GODADDY_API_SECRET: str = os.getenv("GODADDY_API_SECRET", default=None)
+def __getattr__(name: str) -> str | None:
+    if name not in _ENV_KEYS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-OTE_GODADDY_API_KEY: str = os.getenv("OTE_GODADDY_API_KEY", default=None)
-OTE_GODADDY_API_SECRET: str = os.getenv("OTE_GODADDY_API_SECRET", default=None)
+    import dotenv
+
+    dotenv.load_dotenv(dotenv_path=DOTENV_PATH)
+    for key in _ENV_KEYS:
+        globals()[key] = os.getenv(key, default=None)
+    return globals()[name]
 
 
 # --- Global -------------------------------------------------------------------------------------+
@@ -25,10 +45,68 @@ CHECK_AVAILABILITY: (
     bool  # If search for a domain, and True, will check its availability.
 )
 OPEN_AVAILABLE_LINKS: bool  # Open available domains on webbrowser.
-GREP: str | None  # Grep search of stdout result.
+GREP: str | None  # substring every checked domain.tld must contain, see filters.py.
+MATCH: str | None = None  # regex every checked domain.tld must match.
+MIN_LENGTH: int | None = None  # bounds on the length of checked names, TLD excluded.
+MAX_LENGTH: int | None = None
+CHARSET: tuple | None = None  # filters.CHARSETS classes checked names may use.
+AVAILABLE_ONLY: bool = False  # only report AVAILABLE results.
+MAX_PRICE: float | None = None  # only report results priced at most this, in currency units.
 
 GREP_FOUND: bool | None = None
 
+DEDUP_WINDOW: int = 100_000  # recent names remembered to drop repeats from `run --file` input.
+
+TYPO_BEAM: int = 2000  # candidates kept per edit level by `typo --depth`.
+TYPO_CHUNKSIZE: int = 16  # brands handed to a worker process at a time by `typo --file`.
+
+CONCURRENCY: int = 8  # max availability requests in flight at once.
+BULK_SIZE: int = 500  # domains per bulk availability request, 500 is GoDaddy's maximum.
+
+OUTPUT_FORMAT: str = "text"  # text (colored lines) or a machine-readable format of output.WRITERS.
+OUTPUT_PATH: str = "-"  # file written by machine-readable formats, '-' for stdout.
+OUTPUT_BUFFER: int = 1000  # rows buffered between writes by JSONL and CSV output.
+PARQUET_ROW_GROUP: int = 100_000  # rows per Parquet row group.
+
+STATS: bool = False  # record per-stage counters and latencies, see stats.py.
+
+# --- GoDaddy API Client ------------------------------------------------------------------------+
+
+OTE: bool = False  # use the OTE (test) environment and keys instead of production.
+POOL_SIZE: int = 16  # keep-alive connections per host; raised to CONCURRENCY if lower.
+LIST_PAGE_SIZE: int = 1000  # domains per page when listing the account, GoDaddy's maximum.
+PORTFOLIO_MAX_AGE: float = 3600  # seconds before `ls-domains` syncs its local snapshot again.
+PORTFOLIO_SYNC_MARGIN: float = 300  # seconds of overlap between syncs, for clock skew.
+PORTFOLIO_FULL_MAX_AGE: float = 7 * 86400  # seconds before a sync is a full one again, dropping domains that left.
+PORTFOLIO_GONE_STATUSES: frozenset = frozenset(
+    {"CANCELLED", "CANCELLED_TRANSFER", "DELETED_AND_PURCHASED", "DELETED_REDEEMABLE", "TRANSFERRED_OUT"}
+)  # an incremental sync drops domains reported with these, they left the account.
+CONNECT_TIMEOUT: float = 5.0  # seconds.
+READ_TIMEOUT: float = 30.0  # seconds.
+
+# --- DNS Pre-screen ----------------------------------------------------------------------------+
+
+DNS_PRESCREEN: bool = False  # skip the API for names with live NS/SOA delegation.
+DNS_RESOLVER: str = "1.1.1.1:53"  # host[:port] of the recursive resolver used by the pre-screen.
+DNS_CONCURRENCY: int = 64  # DNS queries in flight per batch.
+
+# --- Zone File Index ---------------------------------------------------------------------------+
+
+ZONE_INDEX: str | None = None  # membership index of registered names, consulted before cache and API.
+ZONE_INDEX_FILE: str = "/home/apollo/Code/dotcom/.data/zones.idx"  # default output of `index-zones`.
+ZONE_INDEX_CHUNK: int = 4_000_000  # hashes sorted in memory per spilled run while building.
+
+# --- GoDaddy API Throttling ---------------------------------------------------------------------+
+
+RATE_LIMITS: dict = {  # endpoint: (requests, per seconds). GoDaddy allows 60 req/min per endpoint.
+    "available": (60, 60),
+    "available_bulk": (60, 60),
+    "domains": (60, 60),
+}
+MAX_RETRIES: int = 5  # retries on 429, 5xx and connection errors before giving up.
+BACKOFF_BASE: float = 1.0  # seconds, doubled on every retry (full jitter).
+BACKOFF_MAX: float = 60.0  # ceiling for a single backoff delay, in seconds.
+
 LOGGER: logging.Logger  # main logger object
 
 DATAFRAME: pd.DataFrame
@@ -37,7 +115,24 @@ DATAFRAME: pd.DataFrame
 
 DOWNLOADS_DIR: str = "/home/apollo/Downloads"
 DOTDATA_DIR: str = "/home/apollo/Code/dotcom/.data"
-CACHE_FILE: str = "/home/apollo/Code/dotcom/.log/.cache.json"
+WORDS_FILE: str = "/home/apollo/Code/dotcom/.data/words.txt"  # dictionary for `evaluate`.
+CACHE_DB: str = "/home/apollo/Code/dotcom/.log/.cache.sqlite3"
+CACHE_FILE: str = "/home/apollo/Code/dotcom/.log/.cache.json"  # legacy JSON cache, migrated into CACHE_DB.
+JOBS_DIR: str = "/home/apollo/Code/dotcom/.log/jobs"  # one append-only journal per run/typo job.
+LOG_FILE: str = "/home/apollo/Code/dotcom/log/main.log"
+BENCH_BASELINE: str = "/home/apollo/Code/dotcom/.data/bench.json"  # results `bench` compares against.
+
+# --- Logging ------------------------------------------------------------------------------------+
+
+LOG_MAX_BYTES: int = 0  # rotate the log file at this size, 0 to truncate it on every start instead.
+LOG_BACKUPS: int = 3  # rotated log files kept.
+LOG_FLUSH_RECORDS: int = 512  # log records written between flushes, the queue draining also flushes.
+
+# --- Cache Freshness ----------------------------------------------------------------------------+
+
+CACHE_TTL_AVAILABLE: float = 6 * 3600  # seconds an AVAILABLE result stays fresh; they get taken fast.
+CACHE_TTL_TAKEN: float = 7 * 24 * 3600  # seconds a NOT AVAILABLE result stays fresh.
+CACHE_SWEEP_INTERVAL: float = 300  # seconds between background evictions of expired entries.
 
 # --- Key Board Map for the Typos Generator ------------------------------------------------------+
 
@@ -70,6 +165,71 @@ NEIGHBORINGLETTERS: dict = {
     "z": ["a", "s", "x"],
 }
 
+QWERTZNEIGHBORINGLETTERS: dict = {
+    "a": ["s", "q", "w", "y"],
+    "b": ["v", "n", "g", "h"],
+    "c": ["x", "v", "d", "f"],
+    "d": ["s", "f", "e", "r", "x", "c"],
+    "e": ["w", "r", "s", "d"],
+    "f": ["d", "g", "r", "t", "c", "v"],
+    "g": ["f", "h", "t", "z", "v", "b"],
+    "h": ["g", "j", "z", "u", "b", "n"],
+    "i": ["u", "o", "j", "k"],
+    "j": ["h", "k", "u", "i", "n", "m"],
+    "k": ["j", "l", "i", "o", "m"],
+    "l": ["k", "o", "p"],
+    "m": ["n", "j", "k"],
+    "n": ["b", "m", "h", "j"],
+    "o": ["i", "p", "k", "l"],
+    "p": ["o", "l"],
+    "q": ["w", "a"],
+    "r": ["e", "t", "d", "f"],
+    "s": ["a", "d", "w", "e", "y", "x"],
+    "t": ["r", "z", "f", "g"],
+    "u": ["z", "i", "h", "j"],
+    "v": ["c", "b", "f", "g"],
+    "w": ["q", "e", "a", "s"],
+    "x": ["y", "c", "s", "d"],
+    "y": ["x", "a", "s"],
+    "z": ["t", "u", "g", "h"],
+}
+
+AZERTYNEIGHBORINGLETTERS: dict = {
+    "a": ["z", "q"],
+    "b": ["v", "n", "g", "h"],
+    "c": ["x", "v", "d", "f"],
+    "d": ["s", "f", "e", "r", "x", "c"],
+    "e": ["z", "r", "s", "d"],
+    "f": ["d", "g", "r", "t", "c", "v"],
+    "g": ["f", "h", "t", "y", "v", "b"],
+    "h": ["g", "j", "y", "u", "b", "n"],
+    "i": ["u", "o", "j", "k"],
+    "j": ["h", "k", "u", "i", "n"],
+    "k": ["j", "l", "i", "o"],
+    "l": ["k", "m", "o", "p"],
+    "m": ["l", "p"],
+    "n": ["b", "h", "j"],
+    "o": ["i", "p", "k", "l"],
+    "p": ["o", "l", "m"],
+    "q": ["s", "a", "z", "w"],
+    "r": ["e", "t", "d", "f"],
+    "s": ["q", "d", "z", "e", "w", "x"],
+    "t": ["r", "y", "f", "g"],
+    "u": ["y", "i", "h", "j"],
+    "v": ["c", "b", "f", "g"],
+    "w": ["x", "q", "s"],
+    "x": ["w", "c", "s", "d"],
+    "y": ["t", "u", "g", "h"],
+    "z": ["a", "e", "q", "s"],
+}
+
+KEYBOARD_LAYOUTS: dict = {  # layout: letter neighbors, selected with `typo --layout`.
+    "qwerty": NEIGHBORINGLETTERS,
+    "qwertz": QWERTZNEIGHBORINGLETTERS,
+    "azerty": AZERTYNEIGHBORINGLETTERS,
+}
+KEYBOARD_LAYOUT: str = "qwerty"  # used by typo groups A1 and D1.
+
 NEIGHBORINGNUMPADDIGITS: dict = {
     "0": ["1", "2"],
     "1": ["4", "5", "2", "0"],
@@ -144,6 +304,47 @@ VISUALLYSIMILARCHARS: dict = {
     "Z": ["2", "7"],
 }
 
+HOMOGLYPHS: dict = {  # lower-case look-alikes, for domains rendered in a browser's address bar.
+    "0": ["o"],
+    "1": ["l", "i"],
+    "2": ["z"],
+    "3": ["e"],
+    "4": ["a"],
+    "5": ["s"],
+    "6": ["b"],
+    "7": ["t"],
+    "8": ["b"],
+    "9": ["g", "q"],
+    "a": ["o", "e", "4"],
+    "b": ["6", "8", "d", "h"],
+    "c": ["e", "o"],
+    "d": ["b", "o"],
+    "e": ["c", "3"],
+    "g": ["9", "q"],
+    "h": ["b", "n"],
+    "i": ["1", "l", "j"],
+    "j": ["i"],
+    "l": ["1", "i"],
+    "m": ["n"],
+    "n": ["m", "h", "r"],
+    "o": ["0", "c", "a"],
+    "p": ["q"],
+    "q": ["g", "9", "p"],
+    "r": ["n"],
+    "s": ["5", "z"],
+    "t": ["7", "f"],
+    "u": ["v"],
+    "v": ["u", "y"],
+    "y": ["v"],
+    "z": ["2", "s"],
+}
+
+HOMOGLYPH_SETS: dict = {  # set: look-alike characters, selected with `typo --homoglyphs`.
+    "visual": VISUALLYSIMILARCHARS,
+    "extended": HOMOGLYPHS,
+}
+HOMOGLYPH_SET: str = "visual"  # used by typo group C1.
+
 # --- Terminal Colors ----------------------------------------------------------------------------+
 # Reset
 RESET: str = "\033[0m"
@@ -196,4 +397,4 @@ BG_BRIGHT_MAGENTA: str = "\033[105m"
 BG_BRIGHT_CYAN: str = "\033[106m"
 BG_BRIGHT_WHITE: str = "\033[107m"
 
-__all__: list = [var for var in globals().keys() if not var.startswith("_")]
+__all__: list = [var for var in globals().keys() if not var.startswith("_")] + list(_ENV_KEYS)
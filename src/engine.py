@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import typing
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import const as c
+from . import utils as u
+from .result import Result
+
+
+# A job is (domain, tld, extra): `extra` is merged into the result once it is checked.
+Job = tuple[str, str, dict]
+
+
+async def _check(pool: ThreadPoolExecutor, chunk: list[Job]) -> list[Result]:
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(
+        pool, u.check_cached_availability_bulk, [(domain, tld) for domain, tld, _ in chunk]
+    )
+    return [result.tagged(extra) for result, (_, _, extra) in zip(results, chunk)]
+
+
+def fan_out(names: typing.Iterable[tuple[str, dict]], tlds: typing.Sequence[str]) -> typing.Iterator[Job]:
+    """One job per name and TLD, the TLDs of a name adjacent so they share a bulk request.
+    `names` is consumed once, however many TLDs there are."""
+
+    for name, extra in names:
+        for tld in tlds:
+            yield name, tld, extra
+
+
+def _chunks(jobs: typing.Iterable[Job], size: int) -> typing.Iterator[list[Job]]:
+    jobs = iter(jobs)
+    while chunk := list(itertools.islice(jobs, size)):
+        yield chunk
+
+
+async def check_all(
+    jobs: typing.Iterable[Job],
+    concurrency: int | None = None,
+    batch_size: int | None = None,
+) -> typing.AsyncIterator[Result]:
+    """Check every job, packing them into bulk requests of `batch_size` domains with at most
+    `concurrency` requests in flight. Jobs are pulled lazily and results are yielded as
+    their batch completes. If a batch fails, every other batch already sent is still waited
+    for and yielded before the error is raised, so no answer that was paid for is lost."""
+
+    concurrency = max(1, concurrency or c.CONCURRENCY)
+    chunks = _chunks(jobs, max(1, min(batch_size or c.BULK_SIZE, c.BULK_SIZE)))
+    pending: set[asyncio.Future] = set()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        try:
+            while True:
+                for chunk in itertools.islice(chunks, concurrency - len(pending)):
+                    pending.add(asyncio.ensure_future(_check(pool, chunk)))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                failed = [task for task in done if task.exception() is not None]
+                if failed and pending:  # let the chunks in flight land before giving up.
+                    finished, pending = await asyncio.wait(pending)
+                    done |= finished
+                for task in done:
+                    if task.exception() is None:
+                        for result in task.result():
+                            yield result
+                if failed:
+                    raise failed[0].exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def run(
+    jobs: typing.Iterable[Job],
+    on_result: typing.Callable[[Result], None] = u.final,
+    concurrency: int | None = None,
+    batch_size: int | None = None,
+) -> None:
+    "Blocking entry point: check `jobs` and hand each result to `on_result` as soon as it is ready."
+
+    async def consume() -> None:
+        async for result in check_all(jobs, concurrency, batch_size):
+            on_result(result)
+
+    asyncio.run(consume())
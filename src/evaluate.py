@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import os
+import typing
+
+import numpy as np
+import pandas as pd
+
+from . import const as c
+
+
+# Offline valuation: every feature is computed column-wise over the whole frame, no per-row
+# Python and no API access, so a million candidates score in seconds.
+
+TLD_WEIGHTS: dict = {"com": 1.0, "io": 0.7, "ai": 0.7, "co": 0.6, "net": 0.6, "org": 0.6}
+DEFAULT_TLD_WEIGHT: float = 0.3
+
+# score = sum(weight * feature); lengths past EVAL_IDEAL_LENGTH are penalized.
+EVAL_WEIGHTS: dict = {
+    "is_word": 3.0,
+    "two_words": 1.5,
+    "word_prefix": 0.3,
+    "extra_length": -0.35,
+    "digits": -1.5,
+    "hyphens": -2.0,
+    "vowel_ratio": 1.0,
+    "tld_weight": 2.0,
+    "brand_closeness": 2.0,
+}
+EVAL_IDEAL_LENGTH: int = 6
+
+
+def load_words(path: str | None = None) -> set[str]:
+    "Dictionary used for word features; empty when no word list is installed."
+
+    for candidate in (path, c.WORDS_FILE, "/usr/share/dict/words"):
+        if candidate and os.path.exists(candidate):
+            with open(candidate, "r", encoding="utf-8", errors="replace") as f:
+                return {w for w in (line.strip().lower() for line in f) if len(w) > 1 and w.isalpha()}
+    return set()
+
+
+def frame(domains: typing.Iterable[str], tld: str = "com") -> pd.DataFrame:
+    "Columnar frame of candidates: `name` (second-level label) and `tld`, one row per unique domain."
+
+    parts = [d.lower().rpartition(".") for d in domains]
+    df = pd.DataFrame(
+        {
+            "name": [name if dot else label for name, dot, label in parts],
+            "tld": [label if dot else tld for _, dot, label in parts],
+        },
+        dtype=object,
+    )
+    df.insert(0, "domain", df["name"] + "." + df["tld"])
+    return df.drop_duplicates("domain", ignore_index=True)
+
+
+def _codes(names: pd.Series) -> np.ndarray:
+    "Names as a zero-padded (n, width) uint8 matrix of their ASCII bytes, width >= 8."
+
+    encoded = np.array(
+        [n.encode("ascii", errors="replace") for n in names], dtype=bytes
+    )
+    width = max(encoded.dtype.itemsize, 8)
+    return encoded.astype(f"S{width}").view(np.uint8).reshape(len(names), width)
+
+
+def _packed_words(words: set[str]) -> dict[int, np.ndarray]:
+    "Sorted big-endian uint64 encodings of the dictionary, by word length (up to 8 letters)."
+
+    by_length: dict[int, list[int]] = {}
+    for w in words:
+        if len(w) <= 8 and w.isascii():
+            by_length.setdefault(len(w), []).append(int.from_bytes(w.encode(), "big"))
+    return {k: np.sort(np.array(v, dtype=np.uint64)) for k, v in by_length.items()}
+
+
+def _sorted_words(words: set[str], width: int) -> np.ndarray:
+    "The ASCII words as a sorted, zero-padded byte-string array at least `width` bytes wide."
+
+    encoded = np.array([w.encode() for w in words if w.isascii()], dtype=bytes)
+    return np.sort(encoded.astype(f"S{max(encoded.dtype.itemsize, width)}"))
+
+
+def _isin_sorted(values: np.ndarray, sorted_set: np.ndarray) -> np.ndarray:
+    i = np.searchsorted(sorted_set, values)
+    i[i >= len(sorted_set)] = 0
+    return sorted_set[i] == values
+
+
+def edit_distance(codes: np.ndarray, lengths: np.ndarray, brand: str) -> np.ndarray:
+    """Levenshtein distance from every name to `brand`. The DP runs over brand x max-length
+    cells, each step a numpy operation across all names at once."""
+
+    n, width = codes.shape
+    target = np.frombuffer(brand.encode("ascii", errors="replace"), dtype=np.uint8)
+
+    prev = np.tile(np.arange(width + 1, dtype=np.int16), (n, 1))
+    cur = np.empty_like(prev)
+    step = np.empty(n, dtype=np.int16)
+    for i, ch in enumerate(target, start=1):
+        cur[:, 0] = i
+        for j in range(1, width + 1):
+            np.minimum(prev[:, j], cur[:, j - 1], out=step)
+            step += 1
+            np.minimum(step, prev[:, j - 1] + (codes[:, j - 1] != ch), out=cur[:, j])
+        prev, cur = cur, prev
+
+    return prev[np.arange(n), lengths]
+
+
+def features(df: pd.DataFrame, words: set[str], brand: str | None = None) -> pd.DataFrame:
+    codes = _codes(df["name"])
+    lengths = (codes != 0).sum(axis=1)
+
+    df["length"] = lengths
+    df["extra_length"] = np.maximum(lengths - EVAL_IDEAL_LENGTH, 0)
+    df["digits"] = ((codes >= ord("0")) & (codes <= ord("9"))).sum(axis=1)
+    df["hyphens"] = (codes == ord("-")).sum(axis=1)
+    df["vowel_ratio"] = np.isin(codes, np.frombuffer(b"aeiouy", dtype=np.uint8)).sum(
+        axis=1
+    ) / np.maximum(lengths, 1)
+    df["tld_weight"] = df["tld"].map(TLD_WEIGHTS).fillna(DEFAULT_TLD_WEIGHT)
+
+    # Dictionary features: the first 8 bytes of every name as one big-endian integer, so
+    # "does a k-letter prefix spell a word" is a shift and a binary search per k. The rest
+    # of those names, shifted to the front of a zero-padded row, is a fixed-width byte
+    # string searched the same way in the sorted dictionary.
+    df["is_word"] = df["name"].isin(words)
+    word_prefix = np.zeros(len(df), dtype=np.int8)
+    two_words = np.zeros(len(df), dtype=bool)
+    head8 = np.ascontiguousarray(codes[:, :8]).view(">u8").ravel()
+    width = codes.shape[1]
+    vocab = _sorted_words(words, width)
+
+    for k, packed in sorted(_packed_words(words).items()):
+        is_word = (lengths >= k) & _isin_sorted(head8 >> np.uint64(8 * (8 - k)), packed)
+        word_prefix[is_word] = k
+        rows = np.flatnonzero(is_word & (lengths > k))
+        if len(rows):
+            rest = np.zeros((len(rows), vocab.dtype.itemsize), dtype=np.uint8)
+            rest[:, : width - k] = codes[rows, k:]
+            two_words[rows[_isin_sorted(rest.view(vocab.dtype).ravel(), vocab)]] = True
+
+    df["word_prefix"] = word_prefix
+    df["two_words"] = two_words
+
+    if brand:
+        df["brand_distance"] = edit_distance(codes, lengths, brand.lower())
+        df["brand_closeness"] = 1 / (1 + df["brand_distance"])
+    else:
+        df["brand_closeness"] = 0.0
+
+    return df
+
+
+def score(df: pd.DataFrame) -> pd.DataFrame:
+    "Weighted sum of the features, ranked best first."
+
+    df["score"] = sum(
+        weight * df[feature].astype(float) for feature, weight in EVAL_WEIGHTS.items()
+    )
+    df = df.sort_values("score", ascending=False, ignore_index=True)
+    df.insert(0, "rank", np.arange(1, len(df) + 1))
+    return df
+
+
+def evaluate(
+    domains: typing.Iterable[str],
+    tld: str = "com",
+    brand: str | None = None,
+    words: set[str] | None = None,
+) -> pd.DataFrame:
+    words = load_words() if words is None else words
+    return score(features(frame(domains, tld), words, brand))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import re
+import string
+import typing
+
+from . import const as c
+from .result import Result
+from .stats import stats
+
+
+# Filters are split by what they need. Name predicates run on each candidate before any
+# zone, cache, DNS or API lookup, so a rejected name costs nothing. Result predicates need
+# the availability answer and run after the check, before any output.
+
+CHARSETS: dict = {
+    "letters": string.ascii_lowercase,
+    "digits": string.digits,
+    "hyphen": "-",
+}
+
+
+class NameFilter:
+    """Pre-check predicates. `grep` (substring) and `pattern` (regex, searched) match the
+    whole domain.tld; the length bounds and `charset` (CHARSETS names) apply to the name
+    without its TLD."""
+
+    def __init__(
+        self,
+        grep: str | None = None,
+        pattern: str | None = None,
+        min_length: int | None = None,
+        max_length: int | None = None,
+        charset: typing.Iterable[str] | None = None,
+    ) -> None:
+        self.predicates: list[typing.Callable[[str, str], bool]] = []
+
+        if grep:
+            grep = grep.lower()
+            self.predicates.append(lambda name, tld: grep in f"{name}.{tld}")
+        if pattern:
+            regex = re.compile(pattern, re.IGNORECASE)
+            self.predicates.append(lambda name, tld: regex.search(f"{name}.{tld}") is not None)
+        if min_length:
+            self.predicates.append(lambda name, tld: len(name) >= min_length)
+        if max_length:
+            self.predicates.append(lambda name, tld: len(name) <= max_length)
+        if charset:
+            allowed = frozenset("".join(CHARSETS[cls] for cls in charset))
+            self.predicates.append(lambda name, tld: allowed.issuperset(name))
+
+    def __bool__(self) -> bool:
+        return bool(self.predicates)
+
+    def __call__(self, name: str, tld: str) -> bool:
+        return all(predicate(name, tld) for predicate in self.predicates)
+
+    def jobs(self, jobs: typing.Iterable[tuple[str, str, dict]]) -> typing.Iterator[tuple[str, str, dict]]:
+        "The jobs whose name passes, lazily."
+
+        if not self.predicates:
+            yield from jobs
+            return
+        yield from filter(self.keep, jobs)
+
+    def keep(self, job: tuple[str, str, dict]) -> bool:
+        "Whether a (name, tld, extra) job passes, counting the rejected ones."
+
+        if self(job[0], job[1]):
+            return True
+        stats.count("filter.name_rejected")
+        return False
+
+
+class ResultFilter:
+    "Post-check predicates: `available_only`, and `max_price` in currency units (the API answers in micros)."
+
+    def __init__(self, available_only: bool = False, max_price: float | None = None) -> None:
+        self.available_only = available_only
+        self.max_price = max_price
+
+    def __bool__(self) -> bool:
+        return self.available_only or self.max_price is not None
+
+    def __call__(self, result: Result) -> bool:
+        if self.available_only and result.available is not True:
+            return False
+        price = result.price
+        if self.max_price is not None and price is not None and price / 1_000_000 > self.max_price:
+            return False
+        return True
+
+
+def name_filter() -> NameFilter:
+    return NameFilter(c.GREP, c.MATCH, c.MIN_LENGTH, c.MAX_LENGTH, c.CHARSET)
+
+
+def result_filter() -> ResultFilter:
+    return ResultFilter(c.AVAILABLE_ONLY, c.MAX_PRICE)
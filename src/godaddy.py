@@ -1,9 +1,18 @@
-import requests
+from __future__ import annotations
+
+import datetime
+import math
+import random
+import threading
+import time
 import typing
-import webbrowser
+
+if typing.TYPE_CHECKING:
+    import requests  # imported on first request, it is the slowest import of the CLI.
 
 from . import const as c
 from . import utils as u
+from .stats import stats
 
 
 # NOTE: Some of Godaddy's API services will work, until you own 10+ domains.
@@ -17,40 +26,217 @@ godaddy_eval_link = (
 )
 
 
-def registered_domains() -> typing.Iterator[dict] | None:
-    headers: dict = {
-        "Authorization": f"sso-key {c.GODADDY_API_KEY}:{c.GODADDY_API_SECRET}",
-        "Accept": "application/json",
-    }
+# --- HTTP client ----------------------------------------------------------------------------+
 
-    OTEurl: str = "https://api.ote-godaddy.com/v1/domains"
-    url: str = "https://api.godaddy.com/v1/domains"
+API_URL: str = "https://api.godaddy.com"
+OTE_API_URL: str = "https://api.ote-godaddy.com"
 
-    response = requests.get(url, headers=headers)
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_headers: dict[bool, dict] = {}
 
-    if response.status_code == 200:
-        domains = response.json()
-        for d in domains:
-            yield d
-    else:
-        c.LOGGER.error(f"API ERROR: {response.status_code}: {response.text}")
-        return {
-            "error": True,
-            "status_code": response.status_code,
-            "message": response.text,
+
+def _get_session() -> requests.Session:
+    "Module-wide keep-alive session, so connections are reused across every check."
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            import requests.adapters
+
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=2,  # production + OTE hosts.
+                pool_maxsize=max(c.POOL_SIZE, c.CONCURRENCY),
+            )
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _get_headers(ote: bool) -> dict:
+    if ote not in _headers:
+        key, secret = (
+            (c.OTE_GODADDY_API_KEY, c.OTE_GODADDY_API_SECRET)
+            if ote
+            else (c.GODADDY_API_KEY, c.GODADDY_API_SECRET)
+        )
+        _headers[ote] = {
+            "Authorization": f"sso-key {key}:{secret}",
+            "Accept": "application/json",
         }
+    return _headers[ote]
 
 
-def check_domain_availability(domaintld: str) -> dict | None:
-    OTEurl: str = f"https://api.ote-godaddy.com/v1/domains/available?domain={domaintld}"
-    url: str = f"https://api.godaddy.com/v1/domains/available?domain={domaintld}"
+def _url(path: str) -> str:
+    return (OTE_API_URL if c.OTE else API_URL) + path
+
+
+# --- Rate limiting --------------------------------------------------------------------------+
+
+
+class TokenBucket:
+    "Thread-safe token bucket refilled at `rate` tokens per second, holding at most `capacity`."
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.blocked_until:
+                    self.tokens = min(
+                        self.capacity, self.tokens + (now - self.updated) * self.rate
+                    )
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.blocked_until - now
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        "Stop handing out tokens for `seconds`; used when the API pushes back with a 429."
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.updated = self.blocked_until
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket(endpoint: str) -> TokenBucket:
+    with _buckets_lock:
+        if endpoint not in _buckets:
+            requests_, seconds = c.RATE_LIMITS[endpoint]
+            _buckets[endpoint] = TokenBucket(requests_ / seconds, requests_)
+        return _buckets[endpoint]
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(c.BACKOFF_MAX, c.BACKOFF_BASE * 2**attempt))
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    "Seconds the server asked us to wait, from the Retry-After header or GoDaddy's retryAfterSec."
+
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            seconds = float(header)  # delay-seconds, fractional ones too.
+        except ValueError:
+            pass
+        else:
+            return max(0.0, seconds) if math.isfinite(seconds) else None
+        import email.utils  # rarely needed, and a slow import.
+
+        try:
+            date = email.utils.parsedate_to_datetime(header)
+        except (TypeError, ValueError):  # neither seconds nor an HTTP date.
+            date = None
+        if date is not None:
+            if date.tzinfo is None:  # "-0000" or no zone: HTTP dates are always GMT.
+                date = date.replace(tzinfo=datetime.timezone.utc)
+            return max(0.0, date.timestamp() - time.time())
+
+    try:
+        return float(response.json()["retryAfterSec"])
+    except (ValueError, KeyError, TypeError):
+        return None
 
-    headers = {
-        "Authorization": f"sso-key {c.OTE_GODADDY_API_KEY}:{c.OTE_GODADDY_API_SECRET}",
-        "Accept": "application/json",
-    }
 
-    response = requests.get(OTEurl, headers=headers)
+def _request(endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the `endpoint` rate limit, retrying 429, 5xx and connection errors
+    with jittered exponential backoff. The last response is returned once retries run out."""
+
+    import requests
+
+    for attempt in range(c.MAX_RETRIES + 1):
+        bucket = _bucket(endpoint)
+        with stats.timer("rate_limit.wait"):
+            bucket.acquire()
+
+        try:
+            with stats.timer(f"api.{endpoint}"):
+                response = _get_session().request(
+                    method,
+                    url,
+                    headers=_get_headers(c.OTE),
+                    timeout=(c.CONNECT_TIMEOUT, c.READ_TIMEOUT),
+                    **kwargs,
+                )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            stats.count(f"api.{endpoint}.connection_error")
+            if attempt == c.MAX_RETRIES:
+                raise
+            delay = _backoff(attempt)
+            c.LOGGER.warning(f"{endpoint}: {e!r}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        stats.count(f"api.{endpoint}.http_{response.status_code}")
+        if response.status_code != 429 and response.status_code < 500:
+            return response
+        if attempt == c.MAX_RETRIES:
+            return response
+
+        if response.status_code == 429:
+            delay = _retry_after(response) or _backoff(attempt)
+            bucket.pause(delay)  # every caller of this endpoint waits, not just us.
+        else:
+            delay = _backoff(attempt)
+            time.sleep(delay)
+
+        c.LOGGER.warning(f"{endpoint}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+
+    return response
+
+
+def registered_domains(modified_since: float | None = None) -> typing.Iterator[dict]:
+    """Page through every domain in the account, `marker` being the last domain of the previous
+    page. With `modified_since` (unix time) only domains changed since then are listed."""
+
+    params: dict = {"limit": c.LIST_PAGE_SIZE}
+    if modified_since is not None:
+        params["modifiedDate"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(modified_since))
+
+    while True:
+        response = _request("domains", "GET", _url("/v1/domains"), params=params)
+
+        if response.status_code != 200:
+            c.LOGGER.error(f"API ERROR: {response.status_code}: {response.text}")
+            raise u.APIRequestError(
+                {
+                    "error": True,
+                    "status_code": response.status_code,
+                    "message": response.text,
+                }
+            )
+
+        page: list[dict] = response.json()
+        yield from page
+
+        if len(page) < c.LIST_PAGE_SIZE:
+            return
+        params["marker"] = page[-1]["domain"]
+
+
+@stats.timed("godaddy.check_domain_availability")
+def check_domain_availability(domaintld: str) -> dict | None:
+    response = _request(
+        "available", "GET", _url("/v1/domains/available"), params={"domain": domaintld}
+    )
 
     if response.status_code == 200:
         return response.json()  # Returns availability info
@@ -61,3 +247,75 @@ def check_domain_availability(domaintld: str) -> dict | None:
             "status_code": response.status_code,
             "message": response.text,
         }
+
+
+def _check_singly(domaintlds: list[str]) -> dict[str, dict]:
+    "One GET per domain, stopping at the first answer that would fail every other one too."
+
+    results: dict[str, dict] = {}
+    for d in domaintlds:
+        results[d] = check_domain_availability(d)
+        if results[d].get("status_code") in (401, 403, 429):
+            raise u.APIRequestError(results[d])
+    return results
+
+
+# Bulk answers that reject the batch rather than the account: a malformed or oversized batch,
+# and any 5xx. Worth retrying one domain at a time.
+BATCH_FAILURES: frozenset = frozenset({400, 413, 422})
+
+
+@stats.timed("godaddy.check_domains_availability")
+def check_domains_availability(domaintlds: list[str]) -> dict[str, dict]:
+    """Bulk availability check: POSTs up to const.BULK_SIZE domains at once and maps every result
+    back to the domain it was asked for. Falls back to one GET per domain if the batch itself is
+    rejected (BATCH_FAILURES, 5xx); raises APIRequestError on any other failure (auth, throttling)."""
+
+    if len(domaintlds) == 1:
+        return {domaintlds[0]: check_domain_availability(domaintlds[0])}
+
+    response = _request(
+        "available_bulk",
+        "POST",
+        _url("/v1/domains/available"),
+        params={"checkType": "FAST"},
+        json=domaintlds,
+    )
+
+    if response.status_code >= 500 or response.status_code in BATCH_FAILURES:  # single requests may pass.
+        c.LOGGER.warning(
+            f"Bulk check of {len(domaintlds)} domains failed ({response.status_code}), falling back to single requests."
+        )
+        return _check_singly(domaintlds)
+    if response.status_code not in (200, 203):  # 203: partial success, per-domain errors listed.
+        # 401/403 or a 429 that outlived every retry: one request per domain would fail the same way.
+        c.LOGGER.error(f"API ERROR: {response.status_code}: {response.text}")
+        raise u.APIRequestError(
+            {
+                "error": True,
+                "status_code": response.status_code,
+                "message": response.text,
+            }
+        )
+
+    requested = {d.lower(): d for d in domaintlds}
+    results: dict[str, dict] = {}
+    body = response.json()
+
+    for item in body.get("domains", []):
+        results[requested.get(item["domain"].lower(), item["domain"])] = item
+
+    for item in body.get("errors", []):
+        domain = requested.get(item.get("domain", "").lower())
+        if domain is not None:
+            results[domain] = {
+                "error": True,
+                "status_code": item.get("status"),
+                "message": item.get("message", item.get("code")),
+            }
+
+    for d in domaintlds:  # anything the API silently dropped gets a single request.
+        if d not in results:
+            results[d] = check_domain_availability(d)
+
+    return results
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import secrets
+import threading
+import typing
+
+from . import const as c
+from .result import Result
+
+
+class Journal:
+    """Append-only JSONL record of a `run`/`typo` job, one file per job in JOBS_DIR.
+
+    The first line holds the command and its parameters, then every finished check is
+    appended as {"pos": input position, "domain": ..., "result": {...}} and flushed right
+    away. Failed checks (`error` set) are not recorded, so resuming retries them. A job that
+    runs to the end without failures deletes its journal, so only interrupted jobs keep one.
+    Resuming skips every input position already recorded, so nothing finished is queried
+    twice."""
+
+    def __init__(self, job: str, header: dict, done: set[int], finished: bool) -> None:
+        self.job = job
+        self.header = header
+        self.done = done
+        self.finished = finished
+        self.path = self.path_for(job)
+        self.failed = 0
+        self._inflight: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._file: typing.TextIO | None = None
+
+    @staticmethod
+    def path_for(job: str) -> str:
+        return os.path.join(c.JOBS_DIR, f"{job}.jsonl")
+
+    @classmethod
+    def create(cls, command: str, params: dict) -> Journal:
+        job = f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(3)}"
+        header = {"job": job, "command": command, "params": params}
+
+        os.makedirs(c.JOBS_DIR, exist_ok=True)
+        journal = cls(job, header, set(), False)
+        journal._write(header)
+        return journal
+
+    @classmethod
+    def load(cls, job: str) -> Journal:
+        "Reopen a job; raises FileNotFoundError if there is no journal for it."
+
+        done: set[int] = set()
+        finished = False
+
+        with open(cls.path_for(job), "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:  # torn last line from a crash.
+                    break
+                if record.get("finished"):  # journals used to be kept after the end.
+                    finished = True
+                elif "pos" in record:
+                    done.add(record["pos"])
+
+        return cls(job, header, done, finished)
+
+    def pending(
+        self,
+        jobs: typing.Iterable[tuple[str, str, dict]],
+        keep: typing.Callable[[tuple[str, str, dict]], bool] | None = None,
+    ) -> typing.Iterator[tuple[str, str, dict]]:
+        """Number the jobs by input position and skip the ones this journal already finished.
+        Jobs `keep` rejects are dropped here, before they are waited on, positions still count them."""
+
+        for pos, job in enumerate(jobs):
+            if pos in self.done or (keep is not None and not keep(job)):
+                continue
+            domain, tld, _ = job
+            with self._lock:
+                self._inflight.setdefault(f"{domain}.{tld}".lower(), []).append(pos)
+            yield job
+
+    def record(self, result: Result) -> None:
+        domain = result.domain.lower()
+        with self._lock:
+            positions = self._inflight.get(domain)
+            if not positions:
+                return
+            pos = positions.pop(0)
+            if not positions:
+                del self._inflight[domain]
+            if result.error is not None:  # not an answer: a resumed job asks again.
+                self.failed += 1
+                return
+        self._write({"pos": pos, "domain": result.domain, "result": result.to_dict()})
+
+    def finish(self) -> None:
+        "The job ran to the end: unless some checks failed, nothing is left to resume, drop the journal."
+        self.close()
+        if self.failed:
+            return
+        self.finished = True
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, record: dict) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
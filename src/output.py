@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import sys
+
+from . import const as c
+from .result import FIELDS, Result
+
+
+# Machine-readable result streams for `--output-format`. Rows come straight from the result
+# records, with no colors, links or log lines, and are buffered so a large sweep writes in big
+# blocks instead of one syscall per domain.
+
+
+class ResultWriter:
+    "Buffers result rows and hands them to `_flush` OUTPUT_BUFFER at a time."
+
+    binary: bool = False
+
+    def __init__(self, path: str, buffer: int | None = None, append: bool = False) -> None:
+        self.path = path
+        self.buffer = buffer or c.OUTPUT_BUFFER
+        self.rows: list[dict] = []
+        self.count = 0
+
+        if path == "-":
+            self.file = sys.stdout.buffer if self.binary else sys.stdout
+            self._owned = False
+        else:
+            mode = "a" if append else "w"
+            self.file = open(path, f"{mode}b") if self.binary else open(path, mode, encoding="utf-8", newline="")
+            self._owned = True
+
+    def write(self, result: Result) -> None:
+        self.rows.append({field: getattr(result, field) for field in FIELDS})
+        if len(self.rows) >= self.buffer:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.rows:
+            self._flush(self.rows)
+            self.count += len(self.rows)
+            self.rows = []
+        self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owned:
+            self.file.close()
+
+    def _flush(self, rows: list[dict]) -> None:
+        raise NotImplementedError
+
+    def __enter__(self) -> ResultWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JSONLWriter(ResultWriter):
+    "One JSON object per line."
+
+    def _flush(self, rows: list[dict]) -> None:
+        self.file.write("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows))
+
+
+class CSVWriter(ResultWriter):
+    "Comma-separated, FIELDS as the header row, empty cells for missing values."
+
+    def __init__(self, path: str, buffer: int | None = None, append: bool = False) -> None:
+        super().__init__(path, buffer, append)
+        self._text = io.StringIO()
+        self._csv = csv.DictWriter(self._text, fieldnames=FIELDS, lineterminator="\n")
+        if not (append and self._owned and self.file.tell()):  # appended rows reuse the header.
+            self._csv.writeheader()
+
+    def _flush(self, rows: list[dict]) -> None:
+        self._csv.writerows(rows)
+        self.file.write(self._text.getvalue())
+        self._text.seek(0)
+        self._text.truncate()
+
+    def close(self) -> None:
+        if self.count == 0 and not self.rows:  # header only, if any.
+            self.file.write(self._text.getvalue())
+        super().close()
+
+
+class ParquetWriter(ResultWriter):
+    """Columnar Parquet file with a fixed schema, one row group per PARQUET_ROW_GROUP rows.
+    Needs the optional 'pyarrow' package. A closed Parquet file cannot be appended to."""
+
+    binary = True
+
+    def __init__(self, path: str, buffer: int | None = None, append: bool = False) -> None:
+        if append and path != "-" and os.path.exists(path):
+            raise FileExistsError(f"{path} exists and a Parquet file cannot be appended to.")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires the 'pyarrow' package.") from None
+
+        super().__init__(path, buffer or c.PARQUET_ROW_GROUP, append)
+        self._pa = pa
+        self.schema = pa.schema(
+            [
+                ("domain", pa.string()),
+                ("available", pa.bool_()),
+                ("price", pa.int64()),
+                ("currency", pa.string()),
+                ("period", pa.int64()),
+                ("definitive", pa.bool_()),
+                ("source", pa.string()),
+                ("checked_at", pa.float64()),
+                ("tags", pa.string()),
+                ("brand", pa.string()),
+                ("error", pa.string()),
+            ]
+        )
+        self._parquet = pq.ParquetWriter(pa.PythonFile(self.file, mode="w"), self.schema)
+
+    def _flush(self, rows: list[dict]) -> None:
+        table = self._pa.Table.from_pylist(rows, schema=self.schema)
+        self._parquet.write_table(table, row_group_size=len(rows))
+
+    def close(self) -> None:
+        ResultWriter.flush(self)
+        self._parquet.close()
+        if self._owned:
+            self.file.close()
+
+
+WRITERS: dict[str, type[ResultWriter]] = {
+    "jsonl": JSONLWriter,
+    "csv": CSVWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def open_writer(format: str, path: str = "-", append: bool = False) -> ResultWriter:
+    "`append` continues an existing file, as a resumed job does, instead of truncating it."
+    return WRITERS[format](path, append=append)
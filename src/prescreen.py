@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import secrets
+import socket
+import struct
+import typing
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import const as c
+
+
+# Names with live delegation are registered, so they can skip the rate-limited API round trip.
+# Anything the resolver can't vouch for (NXDOMAIN, SERVFAIL, timeouts) still goes to the API:
+# registered domains on clientHold have no delegation, for one.
+
+NS: int = 2
+SOA: int = 6
+
+NOERROR: int = 0
+
+
+class DelegationResolver(typing.Protocol):
+    def has_delegation(self, domain: str) -> bool: ...
+
+
+class Resolver:
+    "Minimal stdlib DNS client: one UDP query per lookup against a single recursive resolver."
+
+    def __init__(self, host: str = "1.1.1.1", port: int = 53, timeout: float = 2.0, retries: int = 1) -> None:
+        self.address = (host, port)
+        self.timeout = timeout
+        self.retries = retries
+
+    @classmethod
+    def from_string(cls, resolver: str, **kwargs) -> Resolver:
+        "'host' or 'host:port'."
+        host, _, port = resolver.rpartition(":") if ":" in resolver else (resolver, "", "53")
+        return cls(host, int(port), **kwargs)
+
+    @staticmethod
+    def _build(qid: int, domain: str, qtype: int) -> bytes:
+        header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)  # recursion desired.
+        qname = b"".join(
+            bytes([len(label)]) + label
+            for label in domain.rstrip(".").encode("idna").split(b".")
+        )
+        return header + qname + b"\x00" + struct.pack("!HH", qtype, 1)  # class IN.
+
+    def query(self, domain: str, qtype: int) -> tuple[int, int] | None:
+        "(rcode, answer count) for `domain`, or None when the resolver never answered."
+
+        for _ in range(self.retries + 1):
+            qid = secrets.randbelow(0x10000)
+            try:
+                message = self._build(qid, domain, qtype)
+            except UnicodeError:  # not a name DNS can carry, let the API judge it.
+                return None
+
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.settimeout(self.timeout)
+                try:
+                    sock.sendto(message, self.address)
+                    while True:
+                        data, _ = sock.recvfrom(4096)
+                        if len(data) < 12:
+                            continue
+                        rid, flags, _, ancount, _, _ = struct.unpack("!HHHHHH", data[:12])
+                        if rid == qid and flags & 0x8000:  # our id, and a response.
+                            return flags & 0x000F, ancount
+                except (socket.timeout, OSError):
+                    continue
+        return None
+
+    def has_delegation(self, domain: str) -> bool:
+        answer = self.query(domain, NS)
+        if answer is None or answer[0] != NOERROR:
+            return False
+        if answer[1]:
+            return True
+
+        answer = self.query(domain, SOA)  # NODATA on NS, the zone may still exist.
+        return answer is not None and answer[0] == NOERROR and answer[1] > 0
+
+
+resolver: DelegationResolver | None = None
+
+
+def get_resolver() -> DelegationResolver:
+    global resolver
+    if resolver is None:
+        resolver = Resolver.from_string(c.DNS_RESOLVER)
+    return resolver
+
+
+def registered(domains: typing.Sequence[str]) -> set[str]:
+    "The subset of `domains` with live NS/SOA delegation, resolved DNS_CONCURRENCY at a time."
+
+    if not domains:
+        return set()
+
+    resolve = get_resolver()
+    with ThreadPoolExecutor(max_workers=min(c.DNS_CONCURRENCY, len(domains))) as pool:
+        delegated = pool.map(resolve.has_delegation, domains)
+        return {domain for domain, live in zip(domains, delegated) if live}
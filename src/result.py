@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import dataclasses
+
+
+# One checked domain. Results are immutable and shared freely between the cache, the engine,
+# the journal and the writers: tagging a result with its typo groups makes a new record
+# instead of touching the cached one. Links and rendering are derived when it is printed.
+
+# Fields the availability check itself answers, the only ones the cache keeps.
+CANONICAL: tuple = (
+    "domain",
+    "available",
+    "price",
+    "currency",
+    "period",
+    "definitive",
+    "source",
+    "checked_at",
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Result:
+    domain: str
+    available: bool | None = None  # None: not checked.
+    price: int | None = None  # in millionths of `currency`, as the API answers.
+    currency: str | None = None
+    period: int | None = None  # years.
+    definitive: bool | None = None
+    source: str | None = None  # "zone" or "dns" when no API call was needed.
+    checked_at: float | None = None  # unix time of the answer.
+    tags: str | None = None  # typo groups that produced the name, e.g. "[A1,C1]".
+    brand: str | None = None  # brand a batch typo was generated from.
+    error: str | None = None  # why the API could not answer for this domain; never cached.
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Result:
+        "From an API answer or a stored row; unknown keys are dropped, `domain` is required."
+        return cls(**{field: data[field] for field in FIELDS if field in data})
+
+    def tagged(self, extra: dict) -> Result:
+        "Copy with the job's extra fields (tags, brand) set."
+        return dataclasses.replace(self, **extra) if extra else self
+
+    def canonical(self) -> dict:
+        "The fields worth caching, without the unset ones."
+        return {
+            field: value
+            for field in CANONICAL
+            if (value := getattr(self, field)) is not None
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            field: value
+            for field in FIELDS
+            if (value := getattr(self, field)) is not None
+        }
+
+
+FIELDS: tuple = tuple(field.name for field in dataclasses.fields(Result))
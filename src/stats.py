@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import functools
+import json
+import math
+import re
+import threading
+import time
+import typing
+
+from . import const as c
+
+
+# Hot-path counters and latency histograms, recorded only when const.STATS is on (`--stats`,
+# `--stats-file`), so a plain run pays one attribute lookup per probe.
+
+# Bucket upper bounds in seconds, growing by sqrt(2) from 1 microsecond to ~4.5 minutes: any
+# quantile read from them is within ~20% of the true value.
+BOUNDS: tuple = tuple(1e-6 * 2 ** (i / 2) for i in range(57))
+
+QUANTILES: tuple = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    "Thread-safe latency histogram over BOUNDS, with exact count, sum, min and max."
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BOUNDS) + 1)  # last one is +Inf.
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        i = bisect.bisect_left(BOUNDS, seconds)
+        with self.lock:
+            self.buckets[i] += 1
+            self.count += 1
+            self.sum += seconds
+            self.min = min(self.min, seconds)
+            self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        "Linear interpolation inside the bucket holding the q-th observation."
+
+        with self.lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for i, n in enumerate(self.buckets):
+                if n and seen + n >= rank:
+                    lower = BOUNDS[i - 1] if i else 0.0
+                    upper = BOUNDS[i] if i < len(BOUNDS) else self.max
+                    value = lower + (upper - lower) * (rank - seen) / n
+                    return min(max(value, self.min), self.max)
+                seen += n
+            return self.max
+
+
+class Stats:
+    "Named counters and histograms, created on first use."
+
+    def __init__(self) -> None:
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not c.STATS:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not c.STATS:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name: str) -> typing.Iterator[None]:
+        if not c.STATS:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> typing.Callable:
+        "Decorator: observe every call of the function under `name`."
+
+        def decorator(func: typing.Callable) -> typing.Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not c.STATS:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def timed_iter(self, name: str, iterable: typing.Iterable) -> typing.Iterator:
+        "Observe the time spent producing every item of a lazy iterable."
+
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(name, time.perf_counter() - start)
+            yield item
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+    # --- Reports ---------------------------------------------------------------------------+
+
+    def snapshot(self) -> dict:
+        hits, misses = self.counters.get("cache.hit", 0), self.counters.get("cache.miss", 0)
+        return {
+            "started": self.started,
+            "elapsed": time.time() - self.started,
+            "cache_hit_ratio": hits / (hits + misses) if hits + misses else None,
+            "counters": dict(sorted(self.counters.items())),
+            "histograms": {
+                name: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "min": h.min if h.count else 0.0,
+                    "max": h.max,
+                    **{f"p{round(q * 100)}": h.quantile(q) for q in QUANTILES},
+                }
+                for name, h in sorted(self.histograms.items())
+            },
+        }
+
+    def report(self) -> str:
+        "Human-readable summary, latencies in milliseconds."
+
+        snapshot = self.snapshot()
+        lines = [f"Stats over {snapshot['elapsed']:.1f}s"]
+
+        if snapshot["histograms"]:
+            lines.append(
+                f"{'stage':<36} {'count':>10} {'total s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}"
+            )
+            for name, h in snapshot["histograms"].items():
+                lines.append(
+                    f"{name:<36} {h['count']:>10,} {h['sum']:>10.2f} {h['p50'] * 1000:>10.2f}"
+                    f" {h['p95'] * 1000:>10.2f} {h['p99'] * 1000:>10.2f} {h['max'] * 1000:>10.2f}"
+                )
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name:<36} {value:>10,}")
+        if snapshot["cache_hit_ratio"] is not None:
+            lines.append(f"{'cache hit ratio':<36} {snapshot['cache_hit_ratio']:>10.1%}")
+        return "\n".join(lines)
+
+    def json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def prometheus(self, prefix: str = "domainfinder") -> str:
+        "Prometheus text exposition format: counters as *_total, histograms as *_seconds."
+
+        def metric(name: str) -> str:
+            return f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {metric(name)}_total counter", f"{metric(name)}_total {value}"]
+
+        for name, h in sorted(self.histograms.items()):
+            base = f"{metric(name)}_seconds"
+            lines.append(f"# TYPE {base} histogram")
+            with h.lock:
+                buckets, count, total = list(h.buckets), h.count, h.sum
+            cumulative = 0
+            for bound, n in zip(BOUNDS, buckets):
+                cumulative += n
+                lines.append(f'{base}_bucket{{le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{base}_bucket{{le="+Inf"}} {count}')
+            lines += [f"{base}_sum {total}", f"{base}_count {count}"]
+
+        return "\n".join(lines) + "\n"
+
+
+stats = Stats()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing
+
+
+class SQLiteStore:
+    """Shared plumbing: every thread gets its own connection to the file, in WAL mode with a
+    busy timeout, and `_setup` creates or migrates the tables on first connect."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._setup(conn)
+            self._local.conn = conn
+        return conn
+
+    def _setup(self, conn: sqlite3.Connection) -> None:
+        raise NotImplementedError
+
+
+class ResultStore(SQLiteStore):
+    """Availability cache on embedded SQLite in WAL mode, keyed by the full `domain.tld`.
+    Every thread gets its own connection; concurrent runs share the file through WAL
+    and the busy timeout instead of rewriting it.
+
+    Each row carries when it was checked and when it expires; `ttl(result)` decides the
+    lifetime in seconds when it is written. Expired rows read as misses."""
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS results (
+            domain     TEXT PRIMARY KEY,
+            data       TEXT NOT NULL,
+            checked_at REAL NOT NULL DEFAULT 0,
+            expires_at REAL NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)",
+    )
+
+    # Columns added after the first release of the store, migrated in place.
+    COLUMNS: dict = {
+        "checked_at": "REAL NOT NULL DEFAULT 0",
+        "expires_at": "REAL NOT NULL DEFAULT 0",
+    }
+
+    # SQLite caps bound parameters per statement (999 on older builds).
+    MAX_PARAMS: int = 900
+
+    def __init__(self, path: str, ttl: typing.Callable[[dict], float]) -> None:
+        super().__init__(path)
+        self.ttl = ttl
+
+    def _setup(self, conn: sqlite3.Connection) -> None:
+        conn.execute(self.SCHEMA[0])
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        for column, decl in self.COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE results ADD COLUMN {column} {decl}")
+        conn.execute(self.SCHEMA[1])
+
+    def get(self, domain: str) -> dict | None:
+        row = self.conn.execute(
+            "SELECT data FROM results WHERE domain = ? AND expires_at > ?",
+            (domain, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, domains: typing.Sequence[str]) -> dict[str, dict]:
+        "Fresh entries only; stale ones are left out so the caller re-checks and overwrites them."
+        found: dict[str, dict] = {}
+        now = time.time()
+        for i in range(0, len(domains), self.MAX_PARAMS):
+            chunk = domains[i : i + self.MAX_PARAMS]
+            rows = self.conn.execute(
+                f"SELECT domain, data FROM results WHERE domain IN ({','.join('?' * len(chunk))}) AND expires_at > ?",
+                (*chunk, now),
+            )
+            found.update((domain, json.loads(data)) for domain, data in rows)
+        return found
+
+    def put(self, domain: str, result: dict) -> None:
+        self.put_many([(domain, result)])
+
+    def put_many(
+        self, items: typing.Iterable[tuple[str, dict]], checked_at: float | None = None
+    ) -> None:
+        "Upsert one row per result inside a single transaction."
+        now = time.time() if checked_at is None else checked_at
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                "INSERT INTO results (domain, data, checked_at, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET data = excluded.data, "
+                "checked_at = excluded.checked_at, expires_at = excluded.expires_at",
+                (
+                    (domain, json.dumps(result), now, now + self.ttl(result))
+                    for domain, result in items
+                ),
+            )
+
+    def evict_expired(self, batch: int = 1000) -> int:
+        "Delete expired rows a batch at a time so other writers are never locked out for long."
+        evicted = 0
+        while True:
+            deleted = self.conn.execute(
+                "DELETE FROM results WHERE domain IN "
+                "(SELECT domain FROM results WHERE expires_at <= ? LIMIT ?)",
+                (time.time(), batch),
+            ).rowcount
+            evicted += deleted
+            if deleted < batch:
+                return evicted
+
+    def clear(self) -> None:
+        self.conn.execute("DELETE FROM results")
+
+    def import_json(self, path: str) -> int:
+        """One-off migration from the old whole-file `.cache.json`, dated by the file's mtime.
+        Entries are cut down to their canonical fields like any fresh answer, links and
+        errors are dropped."""
+        from .result import Result
+
+        with open(path, "r", encoding="utf-8") as f:
+            legacy: dict = json.load(f)
+        checked_at = os.path.getmtime(path)
+        rows = [
+            (domain, Result.from_dict({**entry, "domain": domain, "checked_at": checked_at}).canonical())
+            for domain, entry in legacy.items()
+            if isinstance(entry, dict) and not entry.get("error") and entry.get("available") is not None
+        ]
+        self.put_many(rows, checked_at=checked_at)
+        return len(rows)
+
+
+class PortfolioStore(SQLiteStore):
+    """Local snapshot of the account's registered domains, refreshed incrementally from the
+    API's modifiedDate filter, so listings are served without any request. Incremental syncs
+    only see domains that still answer the listing: those reported with a `gone` status are
+    dropped, any other departure waits for the next full sync."""
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS portfolio (
+            domain TEXT PRIMARY KEY,
+            data   TEXT NOT NULL
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        ) WITHOUT ROWID
+        """,
+    )
+
+    def _setup(self, conn: sqlite3.Connection) -> None:
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+
+    def _mark(self, key: str) -> float | None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return float(row[0]) if row else None
+
+    @property
+    def synced_at(self) -> float | None:
+        "Unix time the last sync started at, None if the portfolio was never fetched."
+        return self._mark("portfolio_synced_at")
+
+    @property
+    def full_synced_at(self) -> float | None:
+        "Unix time the last full sync started at, None if there was none yet."
+        return self._mark("portfolio_full_synced_at")
+
+    def sync(
+        self,
+        domains: typing.Iterable[dict],
+        started_at: float,
+        full: bool = False,
+        gone: typing.Container[str] = (),
+    ) -> int:
+        """Upsert fetched domains and move the sync marks; a full sync replaces the snapshot.
+        Domains whose status is in `gone` are removed instead."""
+        count = 0
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if full:
+                self.conn.execute("DELETE FROM portfolio")
+            for d in domains:
+                if d.get("status") in gone:
+                    self.conn.execute("DELETE FROM portfolio WHERE domain = ?", (d["domain"],))
+                    continue
+                self.conn.execute(
+                    "INSERT INTO portfolio (domain, data) VALUES (?, ?) "
+                    "ON CONFLICT(domain) DO UPDATE SET data = excluded.data",
+                    (d["domain"], json.dumps(d)),
+                )
+                count += 1
+            for key in ("portfolio_synced_at", "portfolio_full_synced_at") if full else ("portfolio_synced_at",):
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (key, repr(started_at)),
+                )
+        return count
+
+    def domains(self) -> list[dict]:
+        return [json.loads(data) for (data,) in self.conn.execute("SELECT data FROM portfolio")]
@@ -2,105 +2,276 @@
 
 from __future__ import annotations
 
-import pandas as pd
-import sys
-import logging
-import glob
-import os
-import shutil
-import datetime
-import re
+import heapq
 import typing
-import time
-import webbrowser
-import itertools
-import json
 import string
-
-from pathlib import Path
-from datetime import datetime
+import functools
 
 from . import const as c
-from . import utils as u
-from . import godaddy
+from . import engine
+from .stats import stats
 
 
 "https://medium.com/@georg.vetter.privat/how-to-build-a-typo-generator-from-scratch-in-python-ace485aac18b"
 
 
-def _swap_letters(word: str) -> list[str]:
+def _swap_letters(word: str) -> typing.Iterator[str]:
     "swap every letter of a word pairwise. Example: Word, oWrd, Wrod, Wodr"
 
-    swap_list = []
-    for idx, letter in enumerate(word):
-        swap_list.append(word[:idx] + word[idx + 1] + word[idx] + word[idx + 2 :])
-        if idx + 2 == len(word):
-            break
-    return swap_list
+    for idx in range(len(word) - 1):
+        yield word[:idx] + word[idx + 1] + word[idx] + word[idx + 2 :]
 
 
-def _double_letter(word: str) -> list[str]:
+def _double_letter(word: str) -> typing.Iterator[str]:
     "double every letter in the word: Example: WWord, Woord, Worrd, Wordd"
 
-    double_letter_list = []
     for idx, letter in enumerate(word):
-        double_letter_list.append(word[:idx] + letter + word[idx:])
-    return double_letter_list
+        yield word[:idx] + letter + word[idx:]
 
 
-def _one_out(word: str) -> list[str]:
+def _one_out(word: str) -> typing.Iterator[str]:
     "Remove on every possible position one letter from the input word. Example: ord, Wrd, Wod, Wor"
 
-    one_out = []
     for idx in range(len(word)):
-        one_out.append(word[:idx] + word[idx + 1 :])
-    return one_out
+        yield word[:idx] + word[idx + 1 :]
 
 
-def _replace_with_neighbor(word: str, neighbors: dict) -> list[str]:
-    "replace every letter in the word with every possible neighbor on a german keyboard"
+def _replace_with_neighbor(word: str, neighbors: dict[str, tuple[str, ...]]) -> typing.Iterator[str]:
+    "replace every letter in the word with each of its substitutes in a compiled table"
 
-    neighbor_replaced_words = []
     for idx, letter in enumerate(word):
-        for neighbor in neighbors.get(letter.lower(), letter):
-            neighbor_replaced_words.append(word[:idx] + neighbor + word[idx + 1 :])
+        for neighbor in neighbors.get(letter, ()):
+            yield word[:idx] + neighbor + word[idx + 1 :]
 
-    return neighbor_replaced_words
 
+def _b4_after_with_neighbor(word: str, neighbors: dict[str, tuple[str, ...]]) -> typing.Iterator[str]:
+    "place before and after every letter in the word each of its substitutes, every result once"
 
-def _b4_after_with_neighbor(word: str, neighbors: dict) -> list[str]:
-    "place before and after every letter in the word every possible neighbor on a german keyboard"
-
-    neighbor_replaced_words = []
+    seen: set[str] = set()  # "ab" + "b" before "b" and after "a" is the same word.
     for idx, letter in enumerate(word):
-        for neighbor in neighbors.get(letter.lower(), letter):
-            neighbor_replaced_words.append(word[:idx] + neighbor + word[idx:])
-            neighbor_replaced_words.append(word[: idx + 1] + neighbor + word[idx + 1 :])
+        for neighbor in neighbors.get(letter, ()):
+            for typo in (word[:idx] + neighbor + word[idx:], word[: idx + 1] + neighbor + word[idx + 1 :]):
+                if typo not in seen:
+                    seen.add(typo)
+                    yield typo
 
-    return neighbor_replaced_words
 
+_LABEL_CHARS: frozenset = frozenset(string.ascii_lowercase + string.digits + "-")
 
-def generate_typos(domain: str, tld: str, filter: str | None) -> typing.Iterator[dict]:
-    domain = domain.lower()
 
-    typo_groups = {
-        "A1": (_replace_with_neighbor, {"neighbors": c.NEIGHBORINGLETTERS}),
-        "A2": (_replace_with_neighbor, {"neighbors": c.NEIGHBORINGNUMPADDIGITS}),
+def compile_table(mapping: dict) -> dict[str, tuple[str, ...]]:
+    """Substitution table in the form the generators expect: lower-case keys (domains are
+    case-insensitive, so "B" and "b" merge), only characters a domain label can hold, no
+    character mapped to itself and no substitute listed twice. Letters without substitutes
+    are left out, the generators skip them instead of yielding the word unchanged."""
+
+    table: dict[str, dict[str, None]] = {}
+    for key, values in mapping.items():
+        key = key.lower()
+        if key not in _LABEL_CHARS:
+            continue
+        subs = table.setdefault(key, {})
+        for value in values:
+            value = value.lower()
+            if value in _LABEL_CHARS and value != key:
+                subs[value] = None
+    return {key: tuple(subs) for key, subs in table.items() if subs}
+
+
+@functools.lru_cache(maxsize=None)
+def typo_groups(layout: str, homoglyphs: str) -> dict:
+    """Group key: (generator, kwargs), with the substitution tables compiled once per
+    keyboard layout and homoglyph set (KEYBOARD_LAYOUTS, HOMOGLYPH_SETS). Callers resolve
+    the defaults, so a changed setting never hits a stale cache entry."""
+
+    keyboard = compile_table(c.KEYBOARD_LAYOUTS[layout])
+    numpad = compile_table(c.NEIGHBORINGNUMPADDIGITS)
+    lookalikes = compile_table(c.HOMOGLYPH_SETS[homoglyphs])
+    digits = compile_table(c.VISUALLYSIMILARDIGITS)
+
+    return {
+        "A1": (_replace_with_neighbor, {"neighbors": keyboard}),
+        "A2": (_replace_with_neighbor, {"neighbors": numpad}),
         "B1": (_one_out, {}),
         "B2": (_swap_letters, {}),
         "B3": (_double_letter, {}),
-        "C1": (_replace_with_neighbor, {"neighbors": c.VISUALLYSIMILARCHARS}),
-        "C2": (_replace_with_neighbor, {"neighbors": c.VISUALLYSIMILARDIGITS}),
-        "D1": (_b4_after_with_neighbor, {"neighbors": c.NEIGHBORINGLETTERS}),
-        "D2": (_b4_after_with_neighbor, {"neighbors": c.NEIGHBORINGNUMPADDIGITS}),
+        "C1": (_replace_with_neighbor, {"neighbors": lookalikes}),
+        "C2": (_replace_with_neighbor, {"neighbors": digits}),
+        "D1": (_b4_after_with_neighbor, {"neighbors": keyboard}),
+        "D2": (_b4_after_with_neighbor, {"neighbors": numpad}),
     }
 
-    filter = filter.upper() if filter else None
 
-    for key, (func, kwargs) in typo_groups.items():
+def _valid_label(name: str) -> bool:
+    "Registrable as a DNS label: 1 to 63 characters, no leading or trailing hyphen."
+    return 0 < len(name) <= 63 and name[0] != "-" and name[-1] != "-"
+
+
+def _tagged_typos(domain: str, filter: str | None, groups: dict) -> typing.Iterator[tuple[str, str]]:
+    "Lazily yield (typo, group key) for every generation path, duplicates included, invalid labels not."
+
+    for key, (func, kwargs) in groups.items():
         group = key[0]  # A, B, C, D
         if filter is None or filter == group or filter == key:
             for typo in func(domain, **kwargs):
-                result = u.check_cached_availability(typo, tld)
-                result.update({"freq": f"[{key}]"})
-                yield result
+                if _valid_label(typo):
+                    yield typo, key
+
+
+# Plausibility of a single edit from each group, roughly how often it happens by accident.
+# A multi-edit candidate scores the product of its edits and only the best survive each level.
+TYPO_WEIGHTS: dict = {
+    "A1": 0.9,
+    "A2": 0.3,
+    "B1": 0.8,
+    "B2": 0.8,
+    "B3": 0.7,
+    "C1": 0.5,
+    "C2": 0.3,
+    "D1": 0.6,
+    "D2": 0.2,
+}
+
+_MAX_TAGS: int = 4  # edit paths kept per multi-edit candidate, they multiply fast.
+
+
+def _expand(
+    frontier: dict[str, tuple[float, list[str]]],
+    filter: str | None,
+    seen: typing.Container[str],
+    beam: int,
+    groups: dict,
+) -> dict[str, tuple[float, list[str]]]:
+    "One more edit on every frontier word, keeping the `beam` most plausible new candidates."
+
+    level: dict[str, tuple[float, list[str]]] = {}
+
+    for word, (score, tags) in frontier.items():
+        for typo, key in _tagged_typos(word, filter, groups):
+            if typo in seen:
+                continue
+            typo_score = score * TYPO_WEIGHTS[key]
+            path = f"{tags[0]}+{key}"
+            best, paths = level.get(typo, (0.0, []))
+            if path not in paths and len(paths) < _MAX_TAGS:
+                paths.append(path)
+            level[typo] = (max(best, typo_score), paths)
+
+        if len(level) > 4 * beam:  # keep the working set bounded on long names.
+            level = _top(level, beam)
+
+    return _top(level, beam)
+
+
+def _top(level: dict[str, tuple[float, list[str]]], n: int) -> dict[str, tuple[float, list[str]]]:
+    return dict(heapq.nlargest(n, level.items(), key=lambda item: item[1][0]))
+
+
+def unique_typos(
+    domain: str,
+    filter: str | None = None,
+    depth: int = 1,
+    beam: int | None = None,
+    layout: str | None = None,
+    homoglyphs: str | None = None,
+) -> typing.Iterator[tuple[str, list[str]]]:
+    """Yield every distinct typo of `domain` with all the group keys that produce it.
+    Single edits come first, in generation order and unpruned. With `depth` > 1 each
+    further level applies one more edit to the `beam` most plausible candidates of the
+    level before and yields its own `beam` best, tagged by edit path (e.g. A1+B2).
+    The domain itself is never a typo of itself, nor is anything that is not a valid DNS
+    label (empty, over 63 characters, leading or trailing hyphen). `layout` and
+    `homoglyphs` pick the substitution tables, KEYBOARD_LAYOUT and HOMOGLYPH_SET by default."""
+
+    domain = domain.lower()
+    filter = filter.upper() if filter else None
+    beam = beam or c.TYPO_BEAM
+    groups = typo_groups(layout or c.KEYBOARD_LAYOUT, homoglyphs or c.HOMOGLYPH_SET)
+
+    level: dict[str, tuple[float, list[str]]] = {}
+    for typo, key in _tagged_typos(domain, filter, groups):
+        if typo == domain:
+            continue
+        score, keys = level.get(typo, (0.0, []))
+        if key not in keys:
+            keys.append(key)
+        level[typo] = (max(score, TYPO_WEIGHTS[key]), keys)
+
+    seen: set[str] = {domain, *level}
+    for typo, (_, keys) in level.items():
+        yield typo, keys
+
+    frontier = _top(level, beam)
+    for _ in range(depth - 1):
+        frontier = _expand(frontier, filter, seen, beam, groups)
+        if not frontier:
+            break
+        seen.update(frontier)
+        for typo, (_, paths) in frontier.items():
+            yield typo, paths
+
+
+def generate_typos(
+    domain: str,
+    tld: str | typing.Sequence[str],
+    filter: str | None,
+    depth: int = 1,
+    beam: int | None = None,
+) -> typing.Iterator[tuple[str, str, dict]]:
+    """Yield one (typo, tld, extra) job per unique typo and TLD for engine.run; extra carries
+    its group tags. Typos are generated once whatever the number of TLDs."""
+
+    typos = stats.timed_iter("generate_typos", unique_typos(domain, filter, depth, beam))
+    yield from engine.fan_out(
+        ((typo, {"tags": f"[{','.join(keys)}]"}) for typo, keys in typos),
+        (tld,) if isinstance(tld, str) else tld,
+    )
+
+
+def _brand_typos(args: tuple) -> tuple[str, list[tuple[str, list[str]]]]:
+    "Process-pool worker: all unique typos of one brand."
+    brand, filter, depth, beam, layout, homoglyphs = args
+    return brand, list(unique_typos(brand, filter, depth, beam, layout, homoglyphs))
+
+
+def generate_batch_typos(
+    brands: typing.Iterable[str],
+    tld: str | typing.Sequence[str],
+    filter: str | None,
+    depth: int = 1,
+    beam: int | None = None,
+    workers: int | None = None,
+) -> typing.Iterator[tuple[str, str, dict]]:
+    """generate_typos over many brands, one brand per task on a process pool. Results come
+    back in input order (so journal positions are stable) and merge into one stream where
+    each typo appears once, with one job per TLD.
+
+    A typo shared by several brands is tagged with the first brand that produced it and that
+    brand's edit groups only: merging them would hold every job back until the last brand is
+    done. A name that is itself one of the brands is never yielded as a typo of another one
+    (with google and gogle both listed, gogle is not a typo of google), so the brands are read
+    up front."""
+
+    import multiprocessing
+
+    tlds = (tld,) if isinstance(tld, str) else tld
+    brands = list(dict.fromkeys(brands))
+
+    beam = beam or c.TYPO_BEAM
+    # workers may be spawned rather than forked: settings travel with the task, not in `const`.
+    tasks = ((brand, filter, depth, beam, c.KEYBOARD_LAYOUT, c.HOMOGLYPH_SET) for brand in brands)
+    seen: set[str] = set(brands)
+
+    # Never fork: the log listener (and the cache sweeper with -C) are running threads by now.
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    with context.Pool(workers) as pool:
+        results = pool.imap(_brand_typos, tasks, chunksize=c.TYPO_CHUNKSIZE)
+        for brand, typos in stats.timed_iter("generate_batch_typos", results):
+            for typo, keys in typos:
+                if typo in seen:
+                    continue
+                seen.add(typo)
+                extra = {"tags": f"[{','.join(keys)}]", "brand": brand}
+                for tld in tlds:
+                    yield typo, tld, extra
@@ -1,17 +1,25 @@
 #!/usr/bin/env python3
 
+import atexit
+import collections
+import io
 import logging
+import logging.handlers
 import os
-import pandas as pd
+import queue
 import re
 import typing
-import json
 import time
 import sys
-import webbrowser
+import threading
 
 from . import const as c
 from . import godaddy
+from .result import Result
+from .stats import stats
+
+if typing.TYPE_CHECKING:
+    from .store import ResultStore  # sqlite3 is only loaded by the first cache lookup.
 
 
 def get_loglevl(loglevel_str: str) -> int:
@@ -42,149 +50,437 @@ class colorFormatter(logging.Formatter):
     }
     RESET = "\033[0m"
 
-    def format(self, record):
-        log_fmt = "%(levelname)s - %(message)s"
-        formatter = logging.Formatter(log_fmt)
+    def __init__(self) -> None:
+        super().__init__("%(levelname)s - %(message)s")
 
-        msg = formatter.format(record)
+    def format(self, record):
+        msg = super().format(record)
         color = self.COLORS.get(record.levelno, "")
         return f"{color}{msg}{self.RESET}"
 
 
+class BatchedFileHandler(logging.handlers.RotatingFileHandler):
+    """File handler that flushes every `flush_records` records instead of after each one;
+    the queue listener flushes it too whenever the queue runs dry. Rotates at `max_bytes`
+    when that is set, else truncates the file like a plain FileHandler."""
+
+    def __init__(self, filename: str, max_bytes: int = 0, backups: int = 0, flush_records: int = 1) -> None:
+        super().__init__(filename, mode="w", maxBytes=max_bytes, backupCount=backups)
+        self.flush_records = flush_records
+        self._pending = 0
+        self._deferred = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._deferred = True  # StreamHandler.emit flushes after every write.
+        try:
+            super().emit(record)
+        finally:
+            self._deferred = False
+        self._pending += 1
+        if self._pending >= self.flush_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._deferred:
+            self._pending = 0
+            super().flush()
+
+
+class _DrainingListener(logging.handlers.QueueListener):
+    "QueueListener that flushes its handlers each time it has written everything queued."
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+_log_listener: logging.handlers.QueueListener | None = None
+
+
 def init_log_conf() -> None:
-    os.makedirs("/home/apollo/Code/dotcom/log", exist_ok=True)
+    """Callers only put records on a queue; a background listener thread formats them and
+    does the stream and file I/O, so a check never waits on a log write."""
+
+    global _log_listener
+
+    os.makedirs(os.path.dirname(c.LOG_FILE), exist_ok=True)
 
     c.LOGGER = logging.getLogger("main")
     c.LOGGER.setLevel(c.LOGLEVEL)
 
+    handlers: list[logging.Handler] = []
+
     if not c.SILENT:
         stdout_handler = logging.StreamHandler()
         stdout_handler.setLevel(c.LOGLEVEL if c.VERBOSE else logging.ERROR)
         stdout_handler.setFormatter(colorFormatter())
-        c.LOGGER.addHandler(stdout_handler)
+        handlers.append(stdout_handler)
 
     formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
 
-    file_handler = logging.FileHandler(
-        "/home/apollo/Code/dotcom/log/main.log", mode="w"
+    file_handler = BatchedFileHandler(
+        c.LOG_FILE, c.LOG_MAX_BYTES, c.LOG_BACKUPS, c.LOG_FLUSH_RECORDS
     )
     file_handler.setLevel(c.LOGLEVEL)
     file_handler.setFormatter(formatter)
-    c.LOGGER.addHandler(file_handler)
-
+    handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    c.LOGGER.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _log_listener = _DrainingListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    "Write out every queued record and stop the listener thread."
+
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+
+class ResponseFormatter:
+    """Renders a result dict as one output line. Patterns and colors are built once; known
+    keys are classified directly and only unknown keys go through the regexes.
+    With color=False the line is plain text, for piped output."""
+
+    LINK_RE = re.compile(r"https?:\/\/[^\s]+")
+    CURRENCY_RE = re.compile(r"\d+(?:\.\d+)?")
+    AVAILABLE_RE = re.compile(r"^(AVAILABLE|NOT AVAILABLE)$")
+    BRAKETS_RE = re.compile(r"\[([a-zA-Z0-9,+-]+)\]")
+    DOMAIN_RE = re.compile(r"\b[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)+\b")
+
+    # key: output slot. "other" fields are printed as key=value in the middle of the line.
+    KEYS: dict = {
+        "tags": "brakets",
+        "domain": "domain",
+        "available": "available",
+        "available_str": "available",
+        "price": "price",
+        "currency": "unit",
+        "period": "other",
+        "definitive": "other",
+        "source": "other",
+        "brand": "other",
+        "error": "other",
+        "link": "link",
+    }
 
-def format_response(response_dict: dict) -> str:
+    def __init__(self, color: bool = True) -> None:
+        def paint(code: str) -> typing.Callable[[str], str]:
+            return (lambda s: f"{code}{s}{c.RESET}") if color else str
+
+        self.link = paint(c.DIM)
+        self.currency = paint(c.YELLOW)
+        self.brakets = paint(c.DIM)
+        self.domain = paint(c.CYAN)
+        self.available = {
+            True: paint(c.GREEN)("AVAILABLE"),
+            False: paint(c.RED)("NOT AVAILABLE"),
+        }
+
+    def _classify(self, v: str) -> str:
+        if self.LINK_RE.match(v):
+            return "link"
+        if v.isdigit() and self.CURRENCY_RE.match(v):
+            return "price"
+        if self.AVAILABLE_RE.match(v):
+            return "available"
+        if self.BRAKETS_RE.match(v):
+            return "brakets"
+        if self.DOMAIN_RE.match(v):
+            return "domain"
+        return "other"
+
+    def format(self, response_dict: dict) -> str:
+        if response_dict.get("error", False):
+            return " - ".join(f"{k}={v}" for k, v in response_dict.items())
+
+        link = price = available = brakets = domain = None
+        unit = "USD"
+        other_args = []
+
+        for k, v in response_dict.items():
+            slot = self.KEYS.get(k) or self._classify(v if isinstance(v, str) else str(v))
+
+            if slot == "link":
+                link = self.link(v)
+            elif slot == "price" and str(v).isdigit():
+                price = int(v) / 1_000_000  # the API prices in millionths of the currency.
+            elif slot == "unit":
+                unit = v or unit
+            elif slot == "available" and v is not None:
+                available = self.available[v is True or v == "AVAILABLE"]
+            elif slot == "brakets":
+                brakets = self.brakets(v)
+            elif slot == "domain":
+                domain = self.domain(v)
+            elif v is not None:
+                other_args.append(f"{k}={v}")
+
+        currency = self.currency(f"{unit} {price:,.2f}") if price is not None else None
+        return " - ".join(
+            [a for a in (brakets, domain, available, currency, *other_args, link) if a]
+        )
 
-    if response_dict.get("error", False):
-        return response_dict
 
-    if response_dict.get("available", None) is not None:
-        response_dict["available_str"] = (
-            "AVAILABLE" if response_dict["available"] == True else "NOT AVAILABLE"
-        )
+formatter = ResponseFormatter(color=sys.stdout.isatty())
 
-    linke_re = r"https?:\/\/[^\s]+"
-    currency_re = r"\d+(?:\.\d+)?"
-    availabe_re = r"^(AVAILABLE|NOT AVAILABLE)$"
-    brakets_re = r"\[([a-zA-Z0-9-]+)\]"
-    domain_re = r"\b[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)+\b"
 
-    linkcolor = lambda s: f"{c.DIM}{s}{c.RESET}"
-    currencycolor = lambda s: f"{c.YELLOW}{s}{c.RESET}"
-    availablecolor = lambda s: (
-        f"{c.GREEN}{s}{c.RESET}" if s == "AVAILABLE" else f"{c.RED}{s}{c.RESET}"
-    )
-    braketscolor = lambda s: f"{c.DIM}{s}{c.RESET}"
-    domaincolor = lambda s: f"{c.CYAN}{s}{c.RESET}"
-
-    link = raw_link = currency = available = brakets = domain = None
-    other_args = []
-
-    for k, v in response_dict.items():
-        if not isinstance(v, str):
-            v = str(v)
-
-        if re.match(linke_re, v):
-            raw_link = v
-            link = linkcolor(v)
-        elif re.match(currency_re, v) and v.isdigit():
-            currency = f"US$ {int(v):,.2f}"
-            currency = currencycolor(currency)
-        elif re.match(availabe_re, v):
-            available = availablecolor(v)
-        elif re.match(brakets_re, v):
-            brakets = braketscolor(v)
-        elif re.match(domain_re, v):
-            domain = domaincolor(v)
-        else:
-            other_args.append(f"{k}={v}")
+def format_response(response_dict: dict) -> str:
+    return formatter.format(response_dict)
 
-    string: str = " - ".join(
-        [a for a in (brakets, domain, available, currency, *other_args, link) if a]
-    )
 
-    return string
+_ANSI_ESCAPE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
 
 
 def stripcolors(s: str) -> str:
     """
     Remove ANSI color codes from a string for logging or plain output.
     """
-    ansi_escape = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
-    return ansi_escape.sub("", s)
+    return _ANSI_ESCAPE.sub("", s)
 
 
 class APIRequestError(Exception): ...
 
 
+def _rejected_domain(api_response: dict) -> bool:
+    "An API error about the domain itself (e.g. 422 invalid name), not about the key, the rate or the server."
+    status = api_response.get("status_code")
+    return isinstance(status, int) and 400 <= status < 500 and status not in (401, 403, 429)
+
+
+# --- Streaming input. -------------------------------------------+
+
+
+def open_text(path: str) -> typing.TextIO:
+    "Open `path` for text reading: '-' is stdin, .gz and .zst archives are decompressed on the fly."
+
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        import gzip
+
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading .zst files requires the 'zstandard' package.") from None
+
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def parse_tlds(value: str) -> tuple[str, ...]:
+    "'com,net .io' -> ('com', 'net', 'io'): lower-cased, without dots or repeats."
+
+    tlds = (t.strip(".").lower() for t in re.split(r"[\s,]+", value))
+    return tuple(dict.fromkeys(t for t in tlds if t))
+
+
+def normalize_domain(line: str, tld: str | typing.Sequence[str] | None = None) -> str | None:
+    """First field of a line, lower-cased, without the trailing root dot or `.tld` suffix
+    (the first matching one, given several). Blank lines, comments and zone-file directives
+    give None."""
+
+    fields = line.split(None, 1)
+    if not fields or fields[0][0] in "#;$":
+        return None
+
+    name = fields[0].lower().rstrip(".")
+    for suffix in (tld,) if isinstance(tld, str) else tld or ():
+        if name.endswith(f".{suffix}"):
+            name = name[: -len(suffix) - 1]
+            break
+    return name or None
+
+
+def read_domains(
+    path: str, tld: str | typing.Sequence[str] | None = None, window: int | None = None
+) -> typing.Iterator[str]:
+    """Stream normalized names from a file, stdin or archive, one line at a time.
+    Repeats are dropped within the last `window` distinct names (zone files list a name once
+    per record), so memory stays flat however long the input is."""
+
+    window = window or c.DEDUP_WINDOW
+    recent: collections.OrderedDict[str, None] = collections.OrderedDict()
+
+    with open_text(path) as f:
+        for line in f:
+            name = normalize_domain(line, tld)
+            if name is None:
+                continue
+            if name in recent:
+                recent.move_to_end(name)
+                continue
+            recent[name] = None
+            if len(recent) > window:
+                recent.popitem(last=False)
+            yield name
+
+
 # --- Cached availability, if wanted. ----------------------------+
 
-if os.path.exists(c.CACHE_FILE):
-    with open(c.CACHE_FILE, "r", encoding="utf-8") as f:
-        cache = json.load(f)
-else:
-    cache = {}
+_store: "ResultStore | None" = None
+_store_lock = threading.Lock()
+
+
+def _ttl(result: dict) -> float:
+    return c.CACHE_TTL_AVAILABLE if result.get("available") else c.CACHE_TTL_TAKEN
+
 
+def get_store() -> "ResultStore":
+    "Open the result store on first use, migrating the legacy JSON cache if the store is new."
 
-def _save_cache():
-    with open(c.CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(cache, f, indent=2)
+    global _store
+    with _store_lock:
+        if _store is None:
+            from .store import ResultStore
 
+            new = not os.path.exists(c.CACHE_DB)
+            _store = ResultStore(c.CACHE_DB, _ttl)
+            if new and os.path.exists(c.CACHE_FILE):
+                _store.import_json(c.CACHE_FILE)
+        return _store
 
-def check_cached_availability(domain: str, tld: str) -> dict:
-    domain = f"{domain}.{tld}"
 
-    if c.CACHED and domain in cache:
-        return cache[domain]
+def start_cache_sweeper() -> threading.Thread:
+    "Evict expired cache entries now and every CACHE_SWEEP_INTERVAL seconds, on a daemon thread."
+
+    def sweep() -> None:
+        while True:
+            evicted = get_store().evict_expired()
+            if evicted:
+                c.LOGGER.debug(f"cache: evicted {evicted} expired entries")
+            time.sleep(c.CACHE_SWEEP_INTERVAL)
+
+    thread = threading.Thread(target=sweep, name="cache-sweeper", daemon=True)
+    thread.start()
+    return thread
+
+
+def check_cached_availability(domain: str, tld: str) -> Result:
+    return check_cached_availability_bulk([(domain, tld)])[0]
+
+
+@stats.timed("check_cached_availability")
+def check_cached_availability_bulk(pairs: list[tuple[str, str]]) -> list[Result]:
+    """Batched check_cached_availability: cache hits are served locally, misses share bulk
+    requests. Repeated domains get the same Result, which is immutable."""
+
+    domains = [f"{domain}.{tld}" for domain, tld in pairs]
+    results: dict[str, Result] = {}
+    missing: list[str] = []
+    now = time.time()
+
+    unique = list(dict.fromkeys(domains))
+
+    if c.ZONE_INDEX:  # registered according to local zone files: no cache, no API.
+        from . import zoneindex
+
+        index = zoneindex.get_index()
+        for domain in unique:
+            if domain in index:
+                results[domain] = Result(domain, available=False, source="zone", checked_at=now)
+        stats.count("zone.hit", len(results))
+        unique = [domain for domain in unique if domain not in results]
+
+    cached = get_store().get_many(unique) if c.CACHED else {}
+    if c.CACHED:
+        stats.count("cache.hit", len(cached))
+        stats.count("cache.miss", len(unique) - len(cached))
+
+    for domain in unique:
+        if domain in cached:
+            results[domain] = Result.from_dict(cached[domain])
+        elif c.CHECK_AVAILABILITY:
+            missing.append(domain)
+        else:
+            results[domain] = Result(domain)
+
+    if missing and c.DNS_PRESCREEN:
+        from . import prescreen
+
+        with stats.timer("dns_prescreen"):
+            delegated = prescreen.registered(missing)
+        stats.count("dns.hit", len(delegated))
+        if delegated:
+            taken = [
+                Result(domain, available=False, source="dns", checked_at=now)
+                for domain in missing
+                if domain in delegated
+            ]
+            results.update((result.domain, result) for result in taken)
+            missing = [domain for domain in missing if domain not in delegated]
+            if c.CACHED:
+                get_store().put_many((result.domain, result.canonical()) for result in taken)
+
+    stats.count("api.checked", len(missing))
+    for i in range(0, len(missing), c.BULK_SIZE):
+        chunk = missing[i : i + c.BULK_SIZE]
+        api_responses = godaddy.check_domains_availability(chunk)
+        transient = [
+            domain
+            for domain, api_response in api_responses.items()
+            if api_response.get("error", False) and not _rejected_domain(api_response)
+        ]
+        if transient and len(transient) < len(chunk):  # a server hiccup on a few names: ask once more.
+            stats.count("api.domain_retry", len(transient))
+            api_responses.update(godaddy.check_domains_availability(transient))
+        checked: list[tuple[str, dict]] = []
+        errors: list[dict] = []
+        answered = time.time()
+
+        for domain, api_response in api_responses.items():
+            if api_response.get("error", False):
+                errors.append(api_response)
+                message = f"{api_response.get('status_code')}: {api_response.get('message')}"
+                c.LOGGER.warning(f"API could not check {domain!r}: {message}")
+                results[domain] = Result(domain, checked_at=answered, error=message)
+                continue
+            result = Result.from_dict({"domain": domain, **api_response, "checked_at": answered})
+            results[domain] = result
+            checked.append((domain, result.canonical()))
 
-    result = {"domain": domain}
-    if c.CHECK_AVAILABILITY:
-        api_response: dict = godaddy.check_domain_availability(domain)
-        if api_response.get("error", False):
-            raise APIRequestError(api_response)
-        result.update(api_response)
-        cache[domain] = result
         if c.CACHED:
-            _save_cache()
-        time.sleep(1)
+            get_store().put_many(checked)  # keep what succeeded before giving up.
+        stats.count("api.domain_error", len(errors))
+        if len(errors) == len(chunk) and not all(map(_rejected_domain, errors)):
+            raise APIRequestError(errors[0])  # the API itself failed, not just some names.
 
-    return result
+    return [results[domain] for domain in domains]
 
 
-def final(t: dict) -> None:
-    t.update({"link": godaddy.godaddy_search_link(t.get("domain", None))})
+@stats.timed("final")
+def final(result: Result) -> None:
+    "Print and log one result as a colored line; the link and the line are built here, never stored."
 
-    if c.OPEN_AVAILABLE_LINKS and t.get("available"):
-        webbrowser.open(t.get("link", "http://8.8.8.8/"))
+    link = godaddy.godaddy_search_link(result.domain)
 
-    string: str = format_response(t)
+    if c.OPEN_AVAILABLE_LINKS and result.available:
+        import webbrowser
 
-    if c.GREP and c.GREP not in string:
-        return
+        webbrowser.open(link)
+
+    t = result.to_dict()
+    t.pop("checked_at", None)
+    t["link"] = link
+    string: str = format_response(t)
 
-    if t.get("available") == "AVAILABLE":
+    if result.available is True:
         c.LOGGER.info(string)
         if not c.VERBOSE and not c.SILENT:
             print(string)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import array
+import bisect
+import hashlib
+import heapq
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import typing
+
+from . import const as c
+from . import utils as u
+
+
+# On-disk layout: 8-byte magic, uint64 entry count, then the sorted, de-duplicated 64-bit
+# blake2b hashes of every registered `domain.tld`, little-endian. Lookups binary-search the
+# memory-mapped array, so the index never has to fit in memory, and building it is an
+# external sort: sorted runs of ZONE_INDEX_CHUNK hashes are spilled to disk, then merged.
+
+MAGIC: bytes = b"DCZIDX1\x00"
+HEADER = struct.Struct("<8sQ")
+BLOCK: int = 1 << 16  # hashes read or written at a time while merging.
+
+if sys.byteorder != "little":
+    raise ImportError("zoneindex stores native uint64 arrays and expects a little-endian host.")
+
+
+def domain_hash(domain: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(domain.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def _read_run(f: typing.BinaryIO) -> typing.Iterator[int]:
+    while True:
+        block = array.array("Q")
+        block.frombytes(f.read(BLOCK * 8))
+        if not block:
+            return
+        yield from block
+
+
+def _spill(hashes: list[int], tmpdir: str) -> str:
+    hashes.sort()
+    fd, path = tempfile.mkstemp(suffix=".run", dir=tmpdir)
+    with os.fdopen(fd, "wb") as f:
+        array.array("Q", hashes).tofile(f)
+    return path
+
+
+_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"')
+CLASSES: frozenset = frozenset({"in", "ch", "hs", "cs"})
+
+
+def _owners(lines: typing.Iterable[str], tld: str | None) -> typing.Iterator[str]:
+    """Owner names of the NS records in a master-format zone file, i.e. the delegated domains.
+    Comments, directives other than $ORIGIN, records continued inside parentheses, lines that
+    inherit the previous owner (leading whitespace), the apex (`@`) and every other record
+    type (glue A/AAAA, DS, SOA...) are skipped. A line with a single name and no record is
+    taken as is, for plain domain lists."""
+
+    origin = tld.lower().strip(".") if tld else None
+    depth = 0
+    last = None
+
+    for line in lines:
+        if '"' in line:
+            line = _QUOTED.sub('""', line)
+        line = line.split(";", 1)[0]
+        continued = depth > 0
+        depth = max(0, depth + line.count("(") - line.count(")"))
+        if continued or not line.strip() or line[0].isspace():
+            continue
+
+        fields = line.split()
+        owner = fields[0].lower()
+        if owner[0] in "$#":
+            if owner == "$origin" and len(fields) > 1:
+                origin = fields[1].lower().strip(".") or None
+            continue
+        if len(fields) > 1:
+            rtype = next((f for f in fields[1:] if not f[0].isdigit() and f.lower() not in CLASSES), "")
+            if rtype.lower() != "ns":
+                continue
+        if owner == "@":
+            continue
+
+        if owner.endswith(".") or "." in owner or not origin:
+            name = owner.rstrip(".")
+        else:  # relative owner name under $ORIGIN.
+            name = f"{owner}.{origin}"
+        if name and name != origin and name != last:  # consecutive NS records share an owner.
+            last = name
+            yield name
+
+
+def _names(paths: typing.Iterable[str], tld: str | None) -> typing.Iterator[str]:
+    for path in paths:
+        with u.open_text(path) as f:
+            yield from _owners(f, tld)
+
+
+def build(paths: typing.Iterable[str], out: str, tld: str | None = None, chunk: int | None = None) -> int:
+    "Stream every name in the zone files into a new index at `out`; returns the entry count."
+
+    chunk = chunk or c.ZONE_INDEX_CHUNK
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(out) or ".") as tmpdir:
+        runs: list[str] = []
+        hashes: list[int] = []
+        for name in _names(paths, tld):
+            hashes.append(domain_hash(name))
+            if len(hashes) >= chunk:
+                runs.append(_spill(hashes, tmpdir))
+                hashes = []
+        if hashes:
+            runs.append(_spill(hashes, tmpdir))
+
+        files = [open(run, "rb") for run in runs]
+        count = 0
+        try:
+            with open(f"{out}.tmp", "wb") as f:
+                f.write(HEADER.pack(MAGIC, 0))
+                block = array.array("Q")
+                last = None
+                for h in heapq.merge(*(_read_run(run) for run in files)):
+                    if h == last:
+                        continue
+                    block.append(h)
+                    last = h
+                    if len(block) >= BLOCK:
+                        block.tofile(f)
+                        count += len(block)
+                        block = array.array("Q")
+                block.tofile(f)
+                count += len(block)
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, count))
+        finally:
+            for run in files:
+                run.close()
+
+    os.replace(f"{out}.tmp", out)
+    return count
+
+
+class ZoneIndex:
+    "Read-only, memory-mapped membership test over an index written by `build`."
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            magic, self.count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a zone index.")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+        self._hashes = (
+            memoryview(self._mmap)[HEADER.size :].cast("Q") if self._mmap else []
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, domain: str) -> bool:
+        h = domain_hash(domain)
+        i = bisect.bisect_left(self._hashes, h)
+        return i < self.count and self._hashes[i] == h
+
+
+_index: ZoneIndex | None = None
+
+
+def get_index() -> ZoneIndex:
+    global _index
+    if _index is None:
+        _index = ZoneIndex(c.ZONE_INDEX)
+    return _index
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+import importlib
+import os
+import sys
+
+import pytest
+
+
+# The repository is the package itself (run as `python -m <dir>`), so tests import it by
+# its directory name from the parent directory.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+
+
+def load(module: str):
+    "Import `src.<module>` of the package under test."
+    return importlib.import_module(f"{PACKAGE}.src.{module}")
+
+
+@pytest.fixture
+def const(tmp_path, monkeypatch):
+    "const with every on-disk path moved under tmp_path."
+
+    c = load("const")
+    for name, path in {
+        "CACHE_DB": "cache.sqlite3",
+        "CACHE_FILE": "cache.json",
+        "JOBS_DIR": "jobs",
+        "LOG_FILE": "log/main.log",
+    }.items():
+        monkeypatch.setattr(c, name, str(tmp_path / path))
+    return c
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from conftest import load
+
+
+# Journal and --resume, end to end through the CLI. The GoDaddy client is replaced by a
+# stub answering every domain available, failing any batch that holds a domain in `fail`.
+
+NAMES = ["aaa", "bbb", "ccc", "ddd", "eee", "fff", "ggg", "hhh"]
+
+
+class Checker:
+    def __init__(self, u, fail: set[str] = frozenset()) -> None:
+        self.u = u
+        self.fail = set(fail)
+        self.asked: list[str] = []
+
+    def __call__(self, domains: list[str]) -> dict[str, dict]:
+        self.asked += domains
+        if self.fail.intersection(domains):
+            raise self.u.APIRequestError({"error": True, "status_code": 401, "message": "stub"})
+        return {d: {"domain": d, "available": True, "price": 11_990_000, "currency": "USD"} for d in domains}
+
+
+@pytest.fixture
+def cli(const):
+    return load("cli")
+
+
+def _run(cli, output, *args):
+    argv = ["-c", "--batch-size", "2", "--concurrency", "4", "--output-format", "jsonl", "--output", output]
+    return CliRunner().invoke(cli.maincli, [*argv, "run", *args, *NAMES])
+
+
+def _jobs(const) -> list[str]:
+    return [name[: -len(".jsonl")] for name in os.listdir(const.JOBS_DIR)]
+
+
+def test_resume_skips_recorded_positions_and_appends(const, cli, monkeypatch, tmp_path):
+    godaddy, u = load("godaddy"), load("utils")
+    output = str(tmp_path / "out.jsonl")
+
+    failing = Checker(u, fail={"eee.com"})
+    monkeypatch.setattr(godaddy, "check_domains_availability", failing)
+    result = _run(cli, output)
+    assert isinstance(result.exception, u.APIRequestError)
+
+    (job,) = _jobs(const)
+    with open(output) as f:
+        first = [json.loads(line)["domain"] for line in f]
+    # every batch that was answered is in the output, even those still in flight at the error.
+    assert sorted(first) == sorted(f"{n}.com" for n in NAMES if n not in ("eee", "fff"))
+
+    healthy = Checker(u)
+    monkeypatch.setattr(godaddy, "check_domains_availability", healthy)
+    result = _run(cli, output, "--resume", job)
+    assert result.exception is None, result.output
+
+    assert sorted(healthy.asked) == ["eee.com", "fff.com"]  # recorded positions are skipped.
+    with open(output) as f:
+        rows = [json.loads(line)["domain"] for line in f]
+    assert rows[: len(first)] == first  # appended, not rewritten.
+    assert sorted(rows) == sorted(f"{n}.com" for n in NAMES)
+    assert _jobs(const) == []  # finished jobs leave no journal.
+
+
+def test_failed_checks_stay_pending(const, cli, monkeypatch, tmp_path):
+    godaddy, u = load("godaddy"), load("utils")
+    output = str(tmp_path / "out.jsonl")
+
+    def flaky(domains: list[str]) -> dict[str, dict]:
+        return {
+            d: {"error": True, "status_code": 500, "message": "stub"}
+            if d == "bbb.com"
+            else {"domain": d, "available": False}
+            for d in domains
+        }
+
+    monkeypatch.setattr(godaddy, "check_domains_availability", flaky)
+    result = _run(cli, output)
+    assert result.exception is None, result.output
+    (job,) = _jobs(const)  # kept: one check failed.
+
+    healthy = Checker(u)
+    monkeypatch.setattr(godaddy, "check_domains_availability", healthy)
+    result = _run(cli, output, "--resume", job)
+    assert result.exception is None, result.output
+    assert healthy.asked == ["bbb.com"]
+    assert _jobs(const) == []
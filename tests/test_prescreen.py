@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import socket
+import struct
+import threading
+
+import pytest
+
+from conftest import load
+
+
+# prescreen.registered against a stub DNS server on 127.0.0.1: each name has a canned
+# (rcode, answer count) per query type, or no entry at all to drop the query (a timeout).
+
+NS, SOA = 2, 6
+NOERROR, NXDOMAIN = 0, 3
+
+ZONE: dict = {
+    "delegated.com": {NS: (NOERROR, 2)},
+    "apex-only.com": {NS: (NOERROR, 0), SOA: (NOERROR, 1)},  # NODATA on NS, SOA answers.
+    "nodata.com": {NS: (NOERROR, 0), SOA: (NOERROR, 0)},
+    "missing.com": {NS: (NXDOMAIN, 0)},
+    "servfail.com": {NS: (2, 0)},
+}
+
+
+class StubDNS:
+    def __init__(self, zone: dict) -> None:
+        self.zone = zone
+        self.queries: list[tuple[str, int]] = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                data, client = self.sock.recvfrom(512)
+            except OSError:  # closed.
+                return
+            qid = struct.unpack("!H", data[:2])[0]
+            labels, i = [], 12
+            while data[i]:
+                labels.append(data[i + 1 : i + 1 + data[i]].decode())
+                i += 1 + data[i]
+            question = data[12 : i + 5]
+            name, qtype = ".".join(labels), struct.unpack("!H", data[i + 1 : i + 3])[0]
+            self.queries.append((name, qtype))
+
+            answer = self.zone.get(name, {}).get(qtype)
+            if answer is None:
+                continue  # never answered: the client times out.
+            rcode, ancount = answer
+            header = struct.pack("!HHHHHH", qid, 0x8180 | rcode, 1, ancount, 0, 0)
+            self.sock.sendto(header + question, client)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+@pytest.fixture
+def prescreen(monkeypatch):
+    module = load("prescreen")
+    stub = StubDNS(ZONE)
+    monkeypatch.setattr(module, "resolver", module.Resolver("127.0.0.1", stub.port, timeout=0.2, retries=0))
+    monkeypatch.setattr(module, "stub", stub, raising=False)
+    yield module
+    stub.close()
+
+
+def test_ns_answer_is_delegated(prescreen):
+    assert prescreen.registered(["delegated.com"]) == {"delegated.com"}
+
+
+def test_nodata_then_soa_is_delegated(prescreen):
+    assert prescreen.registered(["apex-only.com"]) == {"apex-only.com"}
+    assert prescreen.stub.queries == [("apex-only.com", NS), ("apex-only.com", SOA)]
+
+
+@pytest.mark.parametrize("domain", ["nodata.com", "missing.com", "servfail.com", "silent.com"])
+def test_no_delegation(prescreen, domain):
+    assert prescreen.registered([domain]) == set()
+
+
+def test_non_idna_name_is_never_sent(prescreen):
+    domain = f"{'a' * 64}.com"  # a label over 63 bytes cannot be encoded.
+    assert prescreen.registered([domain]) == set()
+    assert prescreen.stub.queries == []
+
+
+def test_mixed_batch(prescreen):
+    domains = ["delegated.com", "missing.com", "apex-only.com", "silent.com"]
+    assert prescreen.registered(domains) == {"delegated.com", "apex-only.com"}
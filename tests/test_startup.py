@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+# Startup cost of the CLI. Every command pays it, so the heavy dependencies (pandas, requests,
+# dotenv) must only load when a command needs them. Each check runs in a fresh interpreter
+# so nothing imported by the test runner leaks into the measurement.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+LAZY_MODULES: tuple = ("pandas", "numpy", "requests", "dotenv", "sqlite3", "pyarrow")
+
+# Wall time of `--help`, interpreter start included; generous so slow CI machines pass, tight
+# enough to catch an eager pandas import; LAZY_MODULES catches the smaller ones.
+HELP_BUDGET: float = float(os.environ.get("STARTUP_BUDGET", "0.35"))
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(ROOT)}
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=os.path.dirname(ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_cli_import_stays_lazy():
+    code = f"import sys, json; import {PACKAGE}.src.cli; print(json.dumps(sorted(sys.modules)))"
+    loaded = set(json.loads(_python("-c", code).stdout))
+
+    assert not loaded & set(LAZY_MODULES), sorted(loaded & set(LAZY_MODULES))
+
+
+def test_help_within_budget():
+    _python("-m", PACKAGE, "--help")  # warm the bytecode cache.
+
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        _python("-m", PACKAGE, "--help")
+        best = min(best, time.perf_counter() - start)
+
+    assert best < HELP_BUDGET, f"--help took {best * 1000:.0f} ms, budget {HELP_BUDGET * 1000:.0f} ms"